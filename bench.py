@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Callable
+from engine import MLFQEngine
+from process_table import ProcessTable
+import workloads
+
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+QUANTA = (3, 3, 3, 3)
+# Seconds a scripted `python -m mlfq run` may add on top of a bare interpreter
+STARTUP_BUDGET = 0.1
+# Modules that a scripted run must not import
+HEAVY_MODULES = ("tkinter", "numpy", "pandas")
+
+
+# Workload shapes, each built from a seed so runs are comparable between commits
+
+# Sparse arrivals with short bursts keep the queues shallow, so the time per
+# tick is dominated by arrival handling and should stay flat as n grows
+def many_short(n:int, rng:random.Random) -> ProcessTable:
+    table = ProcessTable()
+    for i in range(1, n + 1):
+        table.append(f"P{i}", i * 2, rng.randint(1, 3), rng.randint(1, 4))
+    return table
+
+
+# Long jobs that sink to the lowest queue and overlap a little
+def few_long(n:int, rng:random.Random) -> ProcessTable:
+    table = ProcessTable()
+    for i in range(1, n + 1):
+        table.append(f"P{i}", i * 30, rng.randint(20, 50), rng.randint(1, 4))
+    return table
+
+
+# Groups of 100 processes arriving on the same tick, then a quiet stretch
+def bursty(n:int, rng:random.Random) -> ProcessTable:
+    table = ProcessTable()
+    for i in range(1, n + 1):
+        table.append(f"P{i}", (i // 100) * 300, rng.randint(1, 5), rng.randint(1, 4))
+    return table
+
+
+# One deep queue: every process starts at the top level
+def same_priority(n:int, rng:random.Random) -> ProcessTable:
+    table = ProcessTable()
+    for arrival in sorted(rng.randint(0, n) for _ in range(n)):
+        table.append(f"P{len(table) + 1}", arrival, rng.randint(1, 10), 1)
+    return table
+
+
+# Crowded lower levels with a short aging time, so promotions happen every tick
+def heavy_aging(n:int, rng:random.Random) -> ProcessTable:
+    table = ProcessTable()
+    for arrival in sorted(rng.randint(0, max(n // 4, 1)) for _ in range(n)):
+        table.append(f"P{len(table) + 1}", arrival, rng.randint(5, 15), rng.randint(1, 4))
+    return table
+
+
+# Short CPU bursts between IO waits, so most processes are blocked at any time
+def io_heavy(n:int, rng:random.Random) -> ProcessTable:
+    return workloads.random_io_table(n, rng.randrange(1 << 32))
+
+
+# Shape name -> (workload builder, aging_time, lower_priority_time)
+SHAPES:dict[str, tuple[Callable[[int, random.Random], ProcessTable], int, int]] = {
+    "many_short": (many_short, 5, 6),
+    "few_long": (few_long, 5, 6),
+    "bursty": (bursty, 5, 6),
+    "same_priority": (same_priority, 5, 6),
+    "heavy_aging": (heavy_aging, 1, 2),
+    "io_heavy": (io_heavy, 5, 6),
+}
+
+
+def run_once(workload:ProcessTable, aging_time:int, lower_priority_time:int, event_driven:bool) -> tuple[int, float]:
+    engine = MLFQEngine(workload, QUANTA, aging_time, lower_priority_time, record_gantt=False)
+    start = perf_counter()
+    engine.run(event_driven=event_driven)
+    return engine.time, perf_counter() - start
+
+
+# Peak traced memory and the number of blocks still allocated when the run ends.
+# Those are retained blocks, not a count of every allocation made during the run.
+# Tracing slows the run down, so it is a separate pass from the timed ones.
+def measure_memory(workload:ProcessTable, aging_time:int, lower_priority_time:int, event_driven:bool) -> tuple[int, int]:
+    tracemalloc.start()
+    try:
+        engine = MLFQEngine(workload, QUANTA, aging_time, lower_priority_time, record_gantt=False)
+        engine.run(event_driven=event_driven)
+        _, peak = tracemalloc.get_traced_memory()
+        retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+def median_wall(command:list[str], cwd:str, repeat:int) -> float:
+    walls = []
+    for _ in range(repeat):
+        start = perf_counter()
+        subprocess.run(command, cwd=cwd, check=True, capture_output=True)
+        walls.append(perf_counter() - start)
+    return sorted(walls)[len(walls) // 2]
+
+
+# Cold start of `python -m mlfq run` on a small trace in fresh interpreters: the
+# median wall time, its overhead over a bare interpreter, and the heavy modules it imported
+def measure_startup(repeat:int=10) -> dict:
+    package = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as directory:
+        trace = os.path.join(directory, "trace.csv")
+        with open(trace, "w") as file:
+            file.write("name,arrival,burst,priority\n")
+            for process in workloads.random_processes(20, 0):
+                file.write(f"{process.name},{process.arrival_time},{process.original_burst_time},{process.original_priority}\n")
+        command = [sys.executable, "-m", "mlfq", "run", trace]
+        interpreter = median_wall([sys.executable, "-c", "pass"], package, repeat)
+        run = median_wall(command, package, repeat)
+        imports = subprocess.run([sys.executable, "-X", "importtime", *command[1:]], cwd=package, check=True, capture_output=True, text=True).stderr
+    imported = {line.rsplit("|", 1)[-1].strip().split(".")[0] for line in imports.splitlines()}
+    return {"interpreter": interpreter, "run": run, "overhead": run - interpreter, "heavy_imports": sorted(imported & set(HEAVY_MODULES))}
+
+
+def bench(shapes:list[str], sizes:list[int], repeat:int=3, event_driven:bool=False, memory:bool=True, seed:int=0) -> list[dict]:
+    results:list[dict] = []
+    for shape in shapes:
+        build, aging_time, lower_priority_time = SHAPES[shape]
+        for n in sizes:
+            workload = build(n, random.Random(seed))
+            # Best of `repeat` runs, the least disturbed by the rest of the machine
+            ticks, wall = min((run_once(workload, aging_time, lower_priority_time, event_driven) for _ in range(repeat)), key=lambda run: run[1])
+            result = {"shape": shape, "processes": n, "ticks": ticks, "wall": wall, "ticks_per_sec": ticks / wall if wall > 0 else 0.0}
+            if (memory):
+                result["peak_kib"], result["retained_blocks"] = measure_memory(workload, aging_time, lower_priority_time, event_driven)
+                result["peak_kib"] /= 1024
+            results.append(result)
+            print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result:dict) -> str:
+    line = f"{result['shape']:>14} {result['processes']:>9} {result['ticks']:>11} {result['wall']:>9.3f} {result['ticks_per_sec']:>11.0f}"
+    if ("peak_kib" in result):
+        line += f" {result['peak_kib']:>11.1f} {result['retained_blocks']:>15}"
+    return line
+
+
+# Rows slower or larger than the baseline by more than `tolerance`, as messages
+def compare(results:list[dict], baseline:list[dict], tolerance:float=0.1) -> list[str]:
+    previous = {(row["shape"], row["processes"]): row for row in baseline}
+    regressions:list[str] = []
+    for row in results:
+        old = previous.get((row["shape"], row["processes"]))
+        if (old is None):
+            continue
+        name = f"{row['shape']} n={row['processes']}"
+        if (row["ticks_per_sec"] < old["ticks_per_sec"] * (1 - tolerance)):
+            regressions.append(f"{name}: {row['ticks_per_sec']:.0f} ticks/s, baseline {old['ticks_per_sec']:.0f}")
+        if ("peak_kib" in row and "peak_kib" in old and row["peak_kib"] > old["peak_kib"] * (1 + tolerance)):
+            regressions.append(f"{name}: peak {row['peak_kib']:.1f} KiB, baseline {old['peak_kib']:.1f} KiB")
+    return regressions
+
+
+def int_list(text:str) -> list[int]:
+    return [int(float(value)) for value in text.split(",")]
+
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the MLFQ engine across workload shapes and sizes.")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"comma-separated shapes from {', '.join(SHAPES)}")
+    parser.add_argument("--sizes", type=int_list, default=list(SIZES[:5]), help="comma-separated process counts, up to 1e6")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--event-driven", action="store_true", help="skip idle ticks instead of stepping every tick")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass (peak memory and retained blocks)")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", help="previous --output file to compare against, must not be the --output file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown or memory growth, as a fraction")
+    parser.add_argument("--startup", action="store_true", help="only check the cold start of `python -m mlfq run`")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET, help="allowed start-up seconds over a bare interpreter")
+    args = parser.parse_args(argv)
+
+    if (args.startup):
+        startup = measure_startup()
+        print(f"interpreter {startup['interpreter'] * 1e3:.1f} ms, mlfq run {startup['run'] * 1e3:.1f} ms, overhead {startup['overhead'] * 1e3:.1f} ms (budget {args.startup_budget * 1e3:.0f} ms)")
+        if (startup["heavy_imports"]):
+            print(f"REGRESSION mlfq run imports {', '.join(startup['heavy_imports'])}")
+        if (startup["overhead"] > args.startup_budget):
+            print("REGRESSION start-up is over budget")
+        return 1 if startup["heavy_imports"] or startup["overhead"] > args.startup_budget else 0
+
+    shapes = args.shapes.split(",")
+    unknown = set(shapes) - set(SHAPES)
+    if (unknown):
+        parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+    baseline = None
+    if (args.baseline):
+        # Writing the results over the baseline would compare the run with itself
+        if (os.path.abspath(args.output) == os.path.abspath(args.baseline)):
+            parser.error("--output and --baseline are the same file, pass another --output")
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+
+    print(f"{'shape':>14} {'processes':>9} {'ticks':>11} {'wall (s)':>9} {'ticks/s':>11}" + ("" if args.no_memory else f" {'peak (KiB)':>11} {'retained blocks':>15}"))
+    results = bench(shapes, args.sizes, args.repeat, args.event_driven, not args.no_memory, args.seed)
+    with open(args.output, "w") as output:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "event_driven": args.event_driven,
+            "seed": args.seed,
+            "results": results,
+        }, output, indent=2)
+
+    if (baseline is not None):
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if (regressions):
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import hashlib
+import marshal
+import sqlite3
+import zlib
+from array import array
+from collections import OrderedDict
+from time import time
+from typing import Callable
+from engine import GanttSegment, ScheduleResult
+from process import Process
+from process_table import ProcessTable
+
+
+# Part of every key, bump it when a change to the engines changes their schedules
+CACHE_VERSION = 1
+
+
+# Content hash of a workload: names, arrivals, bursts, priorities and CPU/IO sequences.
+# Hash it once and pass the digest to cache_key() for every configuration run on it.
+def workload_digest(workload:list[Process]|ProcessTable) -> bytes:
+    table = workload if isinstance(workload, ProcessTable) else ProcessTable.from_processes(workload)
+    digest = hashlib.blake2b(digest_size=16)
+    for column in (table.arrival, table.burst, table.priority, table.io):
+        digest.update(column.tobytes())
+    digest.update("\0".join(table.names).encode())
+    digest.update(marshal.dumps(sorted(table.sequences.items())))
+    return digest.digest()
+
+
+# Key of one run: the workload digest plus every setting that changes the schedule.
+# Options name the engine and its extra settings, e.g. cpus=2, mode="steal".
+def cache_key(digest:bytes, quantum_times:list[int], aging_time:int, lower_priority_time:int, io_boost:bool=True, **options) -> str:
+    settings = (CACHE_VERSION, list(quantum_times), aging_time, lower_priority_time, io_boost, sorted(options.items()))
+    return hashlib.blake2b(digest + marshal.dumps(settings), digest_size=16).hexdigest()
+
+
+def dump_result(result:ScheduleResult) -> bytes:
+    table = result.processes
+    return zlib.compress(marshal.dumps((
+        [tuple(segment) for segment in result.segments], table.names,
+        table.arrival.tobytes(), table.burst.tobytes(), table.priority.tobytes(), table.io.tobytes(),
+        table.first_response.tobytes(), table.completion.tobytes(), table.sequences,
+        result.end_time, result.dispatches, result.busy,
+    )))
+
+
+def load_result(data:bytes) -> ScheduleResult:
+    (
+        segments, names, arrival, burst, priority, io, first_response, completion, sequences, end_time, dispatches, busy,
+    ) = marshal.loads(zlib.decompress(data))
+    table = ProcessTable()
+    table.names = names
+    table.arrival, table.burst, table.priority = array('q', arrival), array('q', burst), array('b', priority)
+    table.io, table.first_response, table.completion = array('q', io), array('q', first_response), array('q', completion)
+    table.sequences = sequences
+    return ScheduleResult([GanttSegment(*segment) for segment in segments], table, end_time, dispatches, busy)
+
+
+# Finished runs by cache_key(): the most recently used `capacity` results stay
+# in memory, and with a path every result also goes to a sqlite file that is
+# shared between processes and sessions and trimmed to max_bytes of compressed
+# results, least recently used first. put() stores a copy, but get() hands out
+# the stored result itself, so callers must not modify it.
+class ResultCache:
+    def __init__(self, capacity:int=64, path:str=None, max_bytes:int=256 << 20):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.memory:OrderedDict[str, ScheduleResult] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.db:sqlite3.Connection = None
+        if (path):
+            self.db = sqlite3.connect(path, timeout=30)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data BLOB, size INTEGER, used REAL)")
+            self.db.commit()
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def get(self, key:str) -> ScheduleResult:
+        result = self.memory.get(key)
+        if (result is not None):
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return result
+        if (self.db is not None):
+            row = self.db.execute("SELECT data FROM results WHERE key = ?", (key,)).fetchone()
+            if (row is not None):
+                try:
+                    result = load_result(row[0])
+                except (zlib.error, EOFError, ValueError, TypeError):
+                    result = None
+            if (result is not None):
+                with self.db:
+                    self.db.execute("UPDATE results SET used = ? WHERE key = ?", (time(), key))
+                self.remember(key, result)
+                self.disk_hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    # Keeps a copy, so later runs on the caller's workload table cannot change the cached result
+    def put(self, key:str, result:ScheduleResult):
+        result = ScheduleResult(
+            list(result.segments), result.processes.with_results(), result.end_time, result.dispatches,
+            list(result.busy) if result.busy else result.busy,
+        )
+        self.remember(key, result)
+        if (self.db is not None):
+            data = dump_result(result)
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, data, len(data), time()))
+                self.db.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used DESC) AS total FROM results) WHERE total > ?)",
+                    (self.max_bytes,),
+                )
+
+    def remember(self, key:str, result:ScheduleResult):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while (len(self.memory) > self.capacity):
+            self.memory.popitem(last=False)
+
+    # Cached result for key, or run() it and cache what it returns
+    def run(self, key:str, run:Callable[[], ScheduleResult]) -> ScheduleResult:
+        result = self.get(key)
+        if (result is None):
+            result = run()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        self.memory.clear()
+        if (self.db is not None):
+            with self.db:
+                self.db.execute("DELETE FROM results")
+
+    def close(self):
+        if (self.db is not None):
+            self.db.close()
+            self.db = None
@@ -0,0 +1,402 @@
+import heapq
+import marshal
+import zlib
+from array import array
+from typing import Callable, Iterable, NamedTuple
+from process import Process
+from process_table import ProcessTable
+from ready_queue import ReadyQueue
+
+
+class GanttSegment(NamedTuple):
+    name:str
+    start:int
+    end:int
+    priority:int
+    cpu:int = 0
+
+
+# Event kinds passed to engine listeners as listener(event, time, process, priority),
+# where priority is the level the process is in after the event
+EVENTS = ("arrive", "dispatch", "preempt", "promote", "demote", "complete", "block", "wake")
+
+
+SNAPSHOT_VERSION = 2
+
+
+class ScheduleResult:
+    # busy: ticks each CPU spent running processes, only set by multi-CPU engines
+    def __init__(self, segments:list[GanttSegment], processes:ProcessTable, end_time:int, dispatches:int, busy:list[int]=None):
+        self.segments = segments
+        self.processes = processes
+        self.end_time = end_time
+        self.dispatches = dispatches
+        self.busy = busy
+
+
+# Headless MLFQ scheduler shared by the GUI and the logging script.
+# One call to step() is one tick of the simulation clock. The workload is either
+# a list of Process objects, which the engine schedules in place, a ProcessTable,
+# from which Process objects are only built as they arrive, or an iterable of
+# processes in arrival order (e.g. traces.read_trace) that is pulled lazily and
+# can be consumed only once.
+# record_gantt=False and keep_results=False drop the Gantt segments and the
+# per-process result rows; on_complete is called with every finished process.
+# Functions in listeners receive every scheduling event (see EVENTS).
+# Processes with CPU/IO bursts (Process.from_bursts) leave the CPU at the end of
+# each CPU burst and wait in a heap keyed by wake-up time until their IO is done.
+# Using up lower_priority_time at a level still demotes them when they block;
+# otherwise a process that blocks before its quantum runs out is interactive
+# and, with io_boost, moves up one level.
+class MLFQEngine:
+    # Simulated CPUs, set per engine by SMPEngine
+    cpu_count = 1
+
+    def __init__(
+        self, processes:list[Process]|ProcessTable|Iterable[Process], quantum_times:list[int], aging_time:int=5, lower_priority_time:int=6,
+        record_gantt:bool=True, keep_results:bool=True, on_complete:Callable[[Process], None]=None, io_boost:bool=True,
+    ):
+        self.processes = None
+        self.table = None
+        self.stream = None
+        if (isinstance(processes, ProcessTable)):
+            self.table = processes
+        elif (isinstance(processes, list)):
+            self.processes = processes
+        else:
+            self.stream = processes
+        self.record_gantt = record_gantt
+        self.keep_results = keep_results
+        self.on_complete = on_complete
+        self.io_boost = io_boost
+        self.listeners:list[Callable[[str, int, Process, int], None]] = []
+        self.quantum_times = list(quantum_times)
+        self.levels = len(self.quantum_times)
+        self.aging_time = aging_time
+        self.lower_priority_time = lower_priority_time
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, processes:list[Process], mlfq:dict[int, dict], settings:dict[str, int]) -> "MLFQEngine":
+        return cls(processes, [mlfq[priority]["quantum_time"] for priority in sorted(mlfq)], **settings)
+
+    def reset(self):
+        self.ready = ReadyQueue(self.levels)
+        self.current:Process = None
+        self.start_processing = None
+        self.segments:list[GanttSegment] = []
+        self.time = 0
+        self.end_time = 0
+        # Arrival index: processes in arrival order and the next one to arrive
+        if (self.processes is not None):
+            for process in self.processes:
+                process.reset()
+            self.table = ProcessTable.from_processes(self.processes)
+            self.arrivals = iter(sorted(self.processes, key=lambda process: process.arrival_time))
+        elif (self.stream is not None):
+            self.table = ProcessTable()
+            self.arrivals = self.register(iter(self.stream))
+        else:
+            self.table.clear_results()
+            self.arrivals = map(self.table.process, self.table.arrival_order())
+        self.next_process:Process = next(self.arrivals, None)
+        self.admitted = 0
+        self.completed = 0
+        self.dispatches = 0
+        # Blocked processes as (wake time, block order, process)
+        self.blocked:list[tuple[int, int, Process]] = []
+        self.block_seq = 0
+
+    # Gives streamed processes a pid and, when results are kept, a table row
+    def register(self, stream:Iterable[Process]) -> Iterable[Process]:
+        table = self.table
+        for pid, process in enumerate(stream):
+            if (self.keep_results):
+                pid = table.append(process.name, process.arrival_time, process.original_burst_time, process.original_priority, process.bursts)
+            process.pid = pid
+            yield process
+
+    # Online admission for a live workload (see service.py): the process arrives
+    # at the current tick. Without kept results the caller sets process.pid.
+    def submit(self, process:Process):
+        process.arrival_time = self.time
+        if (self.keep_results):
+            process.pid = self.table.append(process.name, self.time, process.original_burst_time, process.original_priority, process.bursts)
+        self.ready.push(process, self.time)
+        self.admitted += 1
+        if (self.listeners):
+            self.emit("arrive", process)
+
+    def is_finished(self) -> bool:
+        return self.next_process is None and self.completed == self.admitted
+
+    # Waiting time of a queued process as of tick `time`, by default the last executed tick
+    def wait_time(self, process:Process, time:int=None) -> int:
+        return max((self.time - 1 if time is None else time) - process.enqueued_at, 0)
+
+    # Live process count per level, for profiling
+    def queue_lengths(self) -> dict[int, int]:
+        return self.ready.lengths
+
+    # Every queued process as (process, priority), level by level
+    def queued(self) -> list[tuple[Process, int]]:
+        return [(process, priority) for priority in range(1, self.levels + 1) for process in self.ready.level(priority)]
+
+    # The slices still running at the last executed tick, as Gantt segments
+    def running_segments(self) -> list[GanttSegment]:
+        current = self.current
+        if (not current):
+            return []
+        return [GanttSegment(f"{current.name} BT:{current.burst_time}", self.start_processing, self.time - 1, current.priority)]
+
+    def emit(self, event:str, process:Process):
+        for listener in self.listeners:
+            listener(event, self.time, process, process.priority)
+
+    def select_from_queues(self) -> Process:
+        process = self.ready.pop()
+        if (process):
+            process.sub_wait_time = 0
+        return process
+
+    def dispatch(self):
+        self.current = self.select_from_queues()
+        if (self.current):
+            self.dispatches += 1
+            if (self.listeners):
+                self.emit("dispatch", self.current)
+            self.start_processing = self.time
+            if (self.current.first_response is None):
+                self.current.first_response = self.time
+        else:
+            self.start_processing = None
+
+    # One tick: aging, then wake-ups and arrivals, then the running process.
+    # profiling.py replaces step() on the instance to time the phases separately.
+    def step(self):
+        time = self.time
+        self.age(time)
+        self.admit(time)
+        self.process_current(time)
+        self.time += 1
+
+    # Aging: promote the processes that have waited aging_time since they were queued
+    def age(self, time:int):
+        ready = self.ready
+        deadline = time - self.aging_time
+        for priority in range(2, self.levels + 1):
+            while (ready.lengths[priority] and ready.peek(priority).enqueued_at <= deadline):
+                process = ready.popleft(priority)
+                process.increase_priority()
+                ready.push(process, time)
+                if (self.listeners):
+                    self.emit("promote", process)
+
+    # Processes whose IO is done go back to the queue first, then the ones that arrive at this time
+    def admit(self, time:int):
+        blocked = self.blocked
+        if (blocked and blocked[0][0] <= time):
+            self.wake(time)
+        process = self.next_process
+        while (process is not None and process.arrival_time <= time):
+            self.ready.push(process, time)
+            self.admitted += 1
+            if (self.listeners):
+                self.emit("arrive", process)
+            process = next(self.arrivals, None)
+        self.next_process = process
+
+    # Processing the current process, requeueing or completing it at the end of its slice
+    def process_current(self, time:int):
+        current = self.current
+        if (current):
+            current.process()
+            if (time - self.start_processing >= self.quantum_times[current.priority - 1] or current.is_completed()):
+                if (self.record_gantt):
+                    self.segments.append(GanttSegment(current.name, self.start_processing, time, current.priority))
+                if (current.burst_time > 0):
+                    if (current.processed_time >= self.lower_priority_time and current.priority < self.levels):
+                        current.decrease_priority()
+                        if (self.listeners):
+                            self.emit("demote", current)
+                    self.ready.push(current, time)
+                    if (self.listeners):
+                        self.emit("preempt", current)
+                elif (current.pending_io()):
+                    self.block(current, time, time - self.start_processing < self.quantum_times[current.priority - 1])
+                else:
+                    self.finish(current, time)
+                self.dispatch()
+        else:
+            self.dispatch()
+
+    # Bookkeeping for a process whose last CPU burst ended at time
+    def finish(self, process:Process, time:int):
+        process.complete(time)
+        self.completed += 1
+        self.end_time = time
+        if (self.keep_results):
+            self.table.record(process)
+        if (self.on_complete):
+            self.on_complete(process)
+        if (self.listeners):
+            self.emit("complete", process)
+
+    # Ends a CPU burst that is followed by IO. early is True when the process gave up the CPU before its quantum ran out.
+    def block(self, process:Process, time:int, early:bool):
+        if (process.processed_time >= self.lower_priority_time and process.priority < self.levels):
+            process.decrease_priority()
+            if (self.listeners):
+                self.emit("demote", process)
+        elif (early and self.io_boost and process.priority > 1):
+            process.increase_priority()
+            if (self.listeners):
+                self.emit("promote", process)
+        heapq.heappush(self.blocked, (time + process.block(), self.block_seq, process))
+        self.block_seq += 1
+        if (self.listeners):
+            self.emit("block", process)
+
+    def wake(self, time:int):
+        blocked = self.blocked
+        while (blocked and blocked[0][0] <= time):
+            process = heapq.heappop(blocked)[2]
+            self.ready.push(process, time)
+            if (self.listeners):
+                self.emit("wake", process)
+
+    # Earliest tick at which step() can change anything: an arrival, a wake-up,
+    # the end of the running slice or a queued process reaching the aging threshold
+    def next_event_time(self) -> int:
+        time = self.time
+        candidates = []
+        if (self.next_process is not None):
+            candidates.append(self.next_process.arrival_time)
+        if (self.blocked):
+            candidates.append(self.blocked[0][0])
+        if (self.current):
+            quantum_end = self.start_processing + self.quantum_times[self.current.priority - 1]
+            candidates.append(min(quantum_end, time + self.current.burst_time - 1))
+        for priority in range(2, self.levels + 1):
+            process = self.ready.peek(priority)
+            if (process):
+                candidates.append(process.enqueued_at + self.aging_time)
+        return max(min(candidates), time) if candidates else None
+
+    # Event-driven step: fast-forwards over the ticks in which only the current
+    # process makes progress, then runs the next interesting tick
+    def advance(self):
+        target = self.next_event_time()
+        if (target is not None and target > self.time):
+            if (self.current):
+                self.current.process(target - self.time)
+            self.time = target
+        self.step()
+
+    def run(self, event_driven:bool=False) -> ScheduleResult:
+        advance = self.advance if event_driven else self.step
+        while not self.is_finished():
+            advance()
+        return self.result()
+
+    # The result keeps its own copy of the per-process results and segments, as
+    # the next run on the same workload table overwrites the engine's
+    def result(self) -> ScheduleResult:
+        return ScheduleResult(list(self.segments), self.table.with_results(), self.end_time, self.dispatches)
+
+    # Complete engine state at the current tick as zlib-compressed marshal data.
+    # Settings are not part of it, so a snapshot can be restored into an engine
+    # with other quanta or aging to branch a what-if run from that tick.
+    def snapshot(self) -> bytes:
+        if (self.stream is not None):
+            raise ValueError("A streamed workload cannot be snapshotted")
+        live = [self.current] if self.current else []
+        queues = []
+        for priority in range(1, self.levels + 1):
+            queue = list(self.ready.level(priority))
+            live.extend(queue)
+            queues.append([process.pid for process in queue])
+        live.extend(process for _, _, process in self.blocked)
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "workload": self.workload_checksum(),
+            "time": self.time,
+            "end_time": self.end_time,
+            "start_processing": self.start_processing,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "dispatches": self.dispatches,
+            "current": self.current.pid if self.current else None,
+            "queues": queues,
+            "blocked": [(wake, seq, process.pid) for wake, seq, process in self.blocked],
+            "block_seq": self.block_seq,
+            "live": [
+                (process.pid, process.burst_time, process.priority, process.first_response, process.processed_time, process.enqueued_at, process.burst_index)
+                for process in live
+            ],
+            "first_response": self.table.first_response.tobytes(),
+            "completion": self.table.completion.tobytes(),
+            "segments": [tuple(segment) for segment in self.segments],
+        }
+        return zlib.compress(marshal.dumps(state))
+
+    def restore(self, data:bytes):
+        try:
+            state = marshal.loads(zlib.decompress(data))
+        except (zlib.error, EOFError, ValueError, TypeError):
+            raise ValueError("Not an engine snapshot")
+        if (not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION):
+            raise ValueError("Unsupported snapshot version")
+        if (self.stream is not None or state["workload"] != self.workload_checksum()):
+            raise ValueError("The snapshot was taken from a different workload")
+        if (any(priority > self.levels for _, _, priority, *_ in state["live"])):
+            raise ValueError(f"The snapshot has processes below level {self.levels}")
+        self.reset()
+
+        # Replay the arrival index up to the snapshot; completed processes keep only their table results
+        admitted:dict[int, Process] = {}
+        process = self.next_process
+        for _ in range(state["admitted"]):
+            admitted[process.pid] = process
+            process = next(self.arrivals, None)
+        self.next_process = process
+        self.table.first_response = array('q', state["first_response"])
+        self.table.completion = array('q', state["completion"])
+        if (self.processes is not None):
+            for process in admitted.values():
+                if (self.table.completion[process.pid] != ProcessTable.NOT_SET):
+                    process.burst_time = 0
+                    process.burst_index = len(process.bursts) - 1 if process.bursts else 0
+                    process.first_response = self.table.first_response[process.pid]
+                    process.complete(self.table.completion[process.pid])
+
+        for pid, burst_time, priority, first_response, processed_time, enqueued_at, burst_index in state["live"]:
+            process = admitted[pid]
+            process.burst_index = burst_index
+            process.burst_time = burst_time
+            process.priority = priority
+            process.first_response = first_response
+            process.processed_time = processed_time
+            process.enqueued_at = enqueued_at
+        for queue in state["queues"]:
+            for pid in queue:
+                self.ready.push(admitted[pid], admitted[pid].enqueued_at)
+        self.current = admitted[state["current"]] if state["current"] is not None else None
+        self.blocked = [(wake, seq, admitted[pid]) for wake, seq, pid in state["blocked"]]
+        heapq.heapify(self.blocked)
+        self.block_seq = state["block_seq"]
+
+        self.time = state["time"]
+        self.end_time = state["end_time"]
+        self.start_processing = state["start_processing"]
+        self.admitted = state["admitted"]
+        self.completed = state["completed"]
+        self.dispatches = state["dispatches"]
+        self.segments = [GanttSegment(*segment) for segment in state["segments"]]
+
+    def workload_checksum(self) -> int:
+        table = self.table
+        checksum = zlib.crc32(table.arrival.tobytes())
+        for column in (table.burst, table.priority, table.io):
+            checksum = zlib.crc32(column.tobytes(), checksum)
+        return checksum
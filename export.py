@@ -0,0 +1,120 @@
+import importlib.util
+import json
+import os
+import numpy as np
+from engine import ScheduleResult
+from process_table import ProcessTable
+import stats
+import tracing
+
+
+# Columnar files for analysis, one per table, with a JSON metadata dict:
+#   arrow   - Arrow IPC file, memory-mapped on reload (needs pyarrow)
+#   parquet - compressed Parquet, decoded on reload (needs pyarrow)
+#   npy     - directory of one .npy file per column plus metadata.json, memory-mapped on reload
+# Names are strings, everything else is int64 or int8. Unfinished processes have
+# -1 (ProcessTable.NOT_SET) in their result columns rather than nulls, so the
+# numeric columns of arrow and npy exports reload without a copy.
+FORMATS = ("arrow", "parquet", "npy")
+EXTENSIONS = {"arrow": ".arrow", "parquet": ".parquet", "npy": ""}
+
+
+def default_format() -> str:
+    return "arrow" if importlib.util.find_spec("pyarrow") else "npy"
+
+
+def segment_columns(result:ScheduleResult) -> dict[str, np.ndarray]:
+    names, start, end, priority, cpu = zip(*result.segments) if result.segments else ((),) * 5
+    return {
+        "name": np.array(names, dtype=str),
+        "start": np.array(start, dtype=np.int64),
+        "end": np.array(end, dtype=np.int64),
+        "priority": np.array(priority, dtype=np.int8),
+        "cpu": np.array(cpu, dtype=np.int64),
+    }
+
+
+def process_columns(result:ScheduleResult) -> dict[str, np.ndarray]:
+    table = result.processes
+    columns = stats.table_columns(table)
+    arrival, completion, first_response = columns["arrival"], columns["completion"], columns["first_response"]
+    done = completion != ProcessTable.NOT_SET
+    turnaround = np.where(done, completion - arrival, ProcessTable.NOT_SET)
+    return {
+        "pid": np.arange(len(table), dtype=np.int64),
+        "name": np.array(table.names, dtype=str),
+        **columns,
+        "response": np.where(first_response != ProcessTable.NOT_SET, first_response - arrival, ProcessTable.NOT_SET),
+        "turnaround": turnaround,
+        "waiting": np.where(done, turnaround - columns["burst"] - columns["io"], ProcessTable.NOT_SET),
+    }
+
+
+# Records of a binary EventTracer file; the event column holds indices into metadata["events"]
+def event_columns(trace_path:str) -> tuple[dict[str, np.ndarray], dict]:
+    records, events = tracing.load_events(trace_path)
+    return {field: records[field] for field in records.dtype.names}, {"events": events}
+
+
+def write_columns(path:str, columns:dict[str, np.ndarray], format:str, metadata:dict=None) -> str:
+    if (format not in FORMATS):
+        raise ValueError(f"Unknown export format {format!r}, expected one of {', '.join(FORMATS)}")
+    if (format == "npy"):
+        os.makedirs(path, exist_ok=True)
+        for name, column in columns.items():
+            np.save(os.path.join(path, f"{name}.npy"), column)
+        with open(os.path.join(path, "metadata.json"), "w") as file:
+            json.dump({"columns": list(columns), **(metadata or {})}, file)
+        return path
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError(f"The {format} format needs pyarrow, use npy instead") from None
+    table = pa.table({name: pa.array(np.ascontiguousarray(column)) for name, column in columns.items()})
+    table = table.replace_schema_metadata({"mlfq": json.dumps(metadata or {})})
+    if (format == "parquet"):
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        # A single record batch, so every column reloads as one contiguous buffer
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table.combine_chunks())
+    return path
+
+
+# Columns and metadata of an export. Numeric columns of arrow and npy exports
+# are read-only views of the memory-mapped file; name columns are copied.
+def read_columns(path:str) -> tuple[dict[str, np.ndarray], dict]:
+    if (os.path.isdir(path)):
+        with open(os.path.join(path, "metadata.json")) as file:
+            metadata = json.load(file)
+        return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in metadata.pop("columns")}, metadata
+    import pyarrow as pa
+    if (path.endswith(".parquet")):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    metadata = json.loads((table.schema.metadata or {}).get(b"mlfq", b"{}"))
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+        columns[name] = array.to_numpy(zero_copy_only=False)
+    return columns, metadata
+
+
+# Writes segments and processes files into directory and returns their paths
+def export_result(result:ScheduleResult, directory:str, format:str=None) -> list[str]:
+    format = format or default_format()
+    os.makedirs(directory, exist_ok=True)
+    metadata = {"end_time": result.end_time, "dispatches": result.dispatches, "busy": result.busy}
+    return [
+        write_columns(os.path.join(directory, f"segments{EXTENSIONS.get(format, '')}"), segment_columns(result), format, metadata),
+        write_columns(os.path.join(directory, f"processes{EXTENSIONS.get(format, '')}"), process_columns(result), format, metadata),
+    ]
+
+
+def export_events(trace_path:str, path:str, format:str=None) -> str:
+    columns, metadata = event_columns(trace_path)
+    return write_columns(path, columns, format or default_format(), metadata)
@@ -1,9 +1,19 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-from objects import ProcessCard, Process, ModifyWindow, GanttCard
+from tkinter import ttk, messagebox, filedialog
+from objects import ProcessCard, Process, ModifyWindow, GanttChart, ReportWindow
+from cache import ResultCache, cache_key, workload_digest
+from engine import MLFQEngine, ScheduleResult
+from process_table import ProcessTable
+from smp import SMPEngine
+from worker import SimulationWorker, Snapshot
+from profiling import TickProfiler
+from time import perf_counter
+import traces
+import workloads
 import logging
-import random
+import queue
 import sys
+import threading
 
 
 # Global Variables
@@ -16,26 +26,75 @@ processes:list[Process] = [
     Process("P6", 15, 8, 2), 
     Process("P7", 20, 4, 1)
 ]
-mlfq:dict[int, dict[str, list[Process]|int]] = {
-    1:{"queue":[], "quantum_time":3}, 
-    2:{"queue":[], "quantum_time":3}, 
-    3:{"queue":[], "quantum_time":3},
-    4:{"queue":[], "quantum_time":3}
+mlfq:dict[int, dict[str, int]] = {
+    1:{"quantum_time":3}, 
+    2:{"quantum_time":3}, 
+    3:{"quantum_time":3},
+    4:{"quantum_time":3}
 }
 settings:dict[str, int] = {"aging_time": 5, "lower_priority_time": 6}
-current_card:GanttCard = None
-current_process:Process = None
-start_processing = None
-sim_time = 0
+engine:MLFQEngine = None
+queue_cards:dict[Process, ProcessCard] = {}
+pending_events:list[tuple[str, Process, int]] = []
+worker:SimulationWorker = None
 sim_running = False
+drain_job = None
+profiler:TickProfiler = None
+profile_window:ReportWindow = None
+# Finished runs by workload and settings, and the key of the current run (None once a state was loaded into it)
+results = ResultCache()
+run_key:str = None
+last_result:ScheduleResult = None
+
+# Simulation speed: ticks per frame (None runs event-driven steps for a whole frame) and frame delay in ms
+SPEEDS:dict[str, tuple[int, int]] = {
+    "1 tick / 750 ms": (1, 750),
+    "1 tick / frame": (1, 33),
+    "10 ticks / frame": (10, 33),
+    "100 ticks / frame": (100, 33),
+    "As fast as possible": (None, 0),
+}
+DRAIN_INTERVAL = 33
+
+# Ready queue sharing when simulating more than one CPU
+SMP_MODES:dict[str, str] = {
+    "Global queue": "global",
+    "Per-CPU + stealing": "steal",
+    "Per-CPU + migration": "migrate",
+}
+
 
+def cpu_count() -> int:
+    try:
+        return min(max(int(cpus_var.get()), 1), 64)
+    except ValueError:
+        return 1
 
-# Randomizer
+
+# Randomizer, seeded from the Seed box so a workload can be recreated; a blank box picks a new seed and shows it
 def randomize_processes(n=10):
     global processes
-    processes = []
-    for i in range(1, n+1):
-        processes.append(Process(f'P{str(i)}', random.randint(0, 10), random.randint(1, 10), random.randint(1, 4)))
+    text = seed_var.get().strip()
+    if text and not text.isdigit():
+        messagebox.showerror("Error", "Seed must be a non-negative integer")
+        return
+    seed = int(text) if text else workloads.new_seed()
+    processes = workloads.random_processes(n, seed)
+    seed_info_var.set(f"Seed: {seed}")
+    update_process_table()
+
+
+# Trace loader
+def load_trace_file():
+    global processes
+    path = filedialog.askopenfilename(filetypes=[("Traces", "*.csv *.jsonl *.csv.gz *.jsonl.gz"), ("All files", "*")])
+    if not path:
+        return
+    try:
+        processes = list(traces.read_trace(path, len(mlfq)))
+    except (OSError, ValueError) as error:
+        messagebox.showerror("Error", f"Could not load trace: {error}")
+        return
     update_process_table()
 
 
@@ -47,147 +106,317 @@ def update_process_table():
         process_table.insert("", "end", values=(p.name, p.arrival_time, p.original_burst_time, p.priority))
 
 
-def update_queue_display():
-    global queue_frames
-    for i in range(4):
-        for widget in queue_frames[i].winfo_children():
-            process_card:ProcessCard = widget
-            if process_card.process not in mlfq[i+1]["queue"]:
-                process_card.destroy()
-            else:
-                process_card.update_values()
-    for i in range(1, 5):
-        for process in mlfq[i]["queue"]:
-            if process not in map(lambda process_card: process_card.process, queue_frames[i-1].winfo_children()):
-                ProcessCard(queue_frames[i-1], process)
-
-
-def select_from_queues(queue:dict[int, dict[str, list[Process]|int]]) -> Process:
-    global current_card
-    for priority in range(1, 5):
-        if (queue[priority]["queue"]):
-            current_process = queue[priority]["queue"].pop(0)
-            current_card = GanttCard(gantt_inner, current_process)
-            current_process.sub_wait_time = 0
-            return current_process
-    return None
+# Queue display: queue events from the worker are applied as card changes
+def add_queue_card(process:Process, priority:int):
+    queue_cards[process] = ProcessCard(queue_frames[priority-1], process)
+
+
+def remove_queue_card(process:Process):
+    card = queue_cards.pop(process, None)
+    if (card):
+        card.destroy()
+
+
+def clear_queue_display():
+    for card in queue_cards.values():
+        card.destroy()
+    queue_cards.clear()
+    pending_events.clear()
+
+
+def update_queue_display(sim_time:int):
+    # Net effect per process, so a process that arrives and is dispatched in the same frame never gets a card
+    targets:dict[Process, int] = {}
+    for event, process, priority in pending_events:
+        if (event in ("arrive", "preempt", "promote", "wake")):
+            targets[process] = priority
+        elif (event in ("dispatch", "block")):
+            targets[process] = None
+    pending_events.clear()
+    for process, priority in targets.items():
+        remove_queue_card(process)
+        if (priority is not None):
+            add_queue_card(process, priority)
+    for process, card in queue_cards.items():
+        process.sub_wait_time = engine.wait_time(process, sim_time)
+        card.update_values()
+
+
+def render(snapshot:Snapshot):
+    gantt_chart.update_chart(engine.segments, snapshot.running, engine.cpu_count)
+    update_queue_display(snapshot.time)
+    time_var.set(f"Time: {snapshot.time}")
+
+
+def finish_simulation():
+    global sim_running, last_result
+    sim_running = False
+    toggle.configure(state="normal")
+    run_button.configure(text="Run MLFQ")
+    pause_button.configure(text="Pause", state="disabled")
+    clear_queue_display()
+    result = last_result = engine.result()
+    if (run_key):
+        results.put(run_key, result)
+    update_stats(result)
+    time_var.set(f"Simulation finished at Time: {max(engine.time - 1, 0)}")
+
+
+# Drains the worker's snapshots, keeping every queue event but drawing only the latest state
+def drain_updates():
+    global drain_job
+    drain_job = None
+    if not sim_running:
+        return
+
+    while not worker.errors.empty():
+        messagebox.showerror("Error", str(worker.errors.get_nowait()))
+
+    snapshot:Snapshot = None
+    while True:
+        try:
+            snapshot = worker.updates.get_nowait()
+        except queue.Empty:
+            break
+        if (snapshot.queued is not None):
+            # Restored state: earlier events no longer apply, rebuild the cards from the queues
+            clear_queue_display()
+            for process, priority in snapshot.queued:
+                add_queue_card(process, priority)
+        pending_events.extend(snapshot.events)
+
+    if (snapshot):
+        start = perf_counter()
+        render(snapshot)
+        if (profiler):
+            profiler.time_display(start)
+            update_profile()
+    if (snapshot and snapshot.finished):
+        finish_simulation()
+    else:
+        drain_job = root.after(DRAIN_INTERVAL, drain_updates)
+
+
+def stop_worker():
+    global drain_job
+    if (drain_job):
+        root.after_cancel(drain_job)
+        drain_job = None
+    if (worker):
+        worker.stop()
 
 
 def step():
-    global sim_time, sim_running, current_process, start_processing
+    if (sim_running):
+        worker.step()
+
+
+def toggle_pause():
+    if (pause_button.cget("text") == "Pause"):
+        worker.pause()
+        pause_button.configure(text="Resume")
+        step_button.configure(state="normal")
+    else:
+        worker.resume()
+        pause_button.configure(text="Pause")
+        step_button.configure(state="disabled")
+
+
+def change_speed(event=None):
+    if (sim_running):
+        ticks, delay = SPEEDS[speed_var.get()]
+        worker.set_speed(ticks, delay / 1000)
+
+
+# Finishes the run headlessly on the worker and only draws the final state
+def jump_to_end():
     if not sim_running:
+        if show_cached_result():
+            return
+        simulate_mlfq_step(use_cache=False)
+    worker.finish()
+
+
+# Sort processes by arrival then PID, the order the engine schedules them in
+def sort_processes():
+    processes.sort(key=lambda x: (x.arrival_time, int(x.name[1:]) if x.name[1:].isdigit() else 0))
+
+
+def current_key() -> str:
+    quantum_times = [mlfq[priority]["quantum_time"] for priority in sorted(mlfq)]
+    options = {"cpus": cpu_count(), "mode": SMP_MODES[smp_mode_var.get()]} if cpu_count() > 1 else {}
+    return cache_key(workload_digest(processes), quantum_times, settings["aging_time"], settings["lower_priority_time"], **options)
+
+
+# Draws the final state of an earlier run of the same processes and settings without running it again
+def show_cached_result() -> bool:
+    global last_result
+    sort_processes()
+    result = results.get(current_key())
+    if (result is None):
+        return False
+    last_result = result
+    gantt_chart.clear()
+    clear_queue_display()
+    gantt_chart.update_chart(result.segments, (), len(result.busy) if result.busy else 1)
+    update_stats(result)
+    time_var.set(f"Simulation finished at Time: {result.end_time} (cached)")
+    return True
+
+
+# Snapshots are taken and restored on the worker thread, between ticks
+def save_state():
+    if not sim_running:
+        messagebox.showinfo("Save State", "Run the simulation to save its state")
         return
+    path = filedialog.asksaveasfilename(defaultextension=".mlfq", filetypes=[("MLFQ state", "*.mlfq"), ("All files", "*")])
+    if path:
+        worker.save(path)
 
-    #Waiting process and aging
-    for priority in range(1, 5):
-        for process in mlfq[priority]["queue"]:
-            process.wait()
-            if (process.sub_wait_time >= settings.get("aging_time") and process.priority > 1):
-                process.increase_priority()
-                mlfq[priority]["queue"].remove(process)
-                mlfq[process.priority]["queue"].append(process)
-
-    # Checking arrival time to add to queue
-    for process in processes:
-        if process.arrival_time == sim_time:
-            mlfq[process.priority]["queue"].append(process)
-        
-    
-    #Processing the current process
-    if (current_process):
-        current_process.process()
-        if (current_card):
-            current_card.update_values()
-        if (sim_time - start_processing >= mlfq[current_process.priority]["quantum_time"] or current_process.is_completed()):
-            if (current_process.burst_time > 0):
-                if (current_process.processed_time >= settings.get("lower_priority_time") and current_process.priority < 4):
-                    current_process.decrease_priority()
-                mlfq[current_process.priority]["queue"].append(current_process)
-            else:
-                current_process.complete(sim_time)
-            current_process = select_from_queues(mlfq)
-            if (current_process):
-                start_processing = sim_time
-                if (not current_process.first_response):
-                    current_process.first_response = sim_time
-            else:
-                start_processing = None
 
-    else:
-        current_process = select_from_queues(mlfq)
-        if (current_process):
-            start_processing = sim_time
-            if (not current_process.first_response):
-                current_process.first_response = sim_time
-    
-    update_queue_display()
-    time_var.set(f"Time: {sim_time}")
-    
-    if (all(process.is_completed() for process in processes)):
-        sim_running = False
-        toggle.configure(state="normal")
-        run_button.configure(text="Run MLFQ")
-        update_stats()
-        time_var.set(f"Simulation finished at Time: {sim_time}")
-    else:
-        if (sim_automatic.get()):
-            root.after(750, step)
+# Restores into a fresh run of the current processes and settings, so changed settings branch a what-if run
+def load_state():
+    global run_key
+    path = filedialog.askopenfilename(filetypes=[("MLFQ state", "*.mlfq"), ("All files", "*")])
+    if not path:
+        return
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError as error:
+        messagebox.showerror("Error", f"Could not load state: {error}")
+        return
+    if sim_running:
+        simulate_mlfq_step()
+    simulate_mlfq_step(use_cache=False)
+    run_key = None
+    worker.restore(data)
 
-    sim_time += 1
 
+# Columnar files of the last finished run for analysis, see export.py
+def export_results():
+    if (last_result is None):
+        messagebox.showinfo("Export Results", "Finish a run to export its results")
+        return
+    directory = filedialog.askdirectory()
+    if not directory:
+        return
+    import export
+    try:
+        paths = export.export_result(last_result, directory)
+    except (OSError, ValueError) as error:
+        messagebox.showerror("Error", f"Could not export results: {error}")
+        return
+    messagebox.showinfo("Export Results", "Wrote " + ", ".join(paths))
 
-# Simulation (Round Robin with animated cards & time counter)
-def simulate_mlfq_step():
-    global sim_time, sim_running, current_process, current_card
+
+# Simulation (Round Robin with animated cards & time counter), run on a worker thread.
+# A run that would only show its final state shows a cached result when there is one.
+def simulate_mlfq_step(use_cache:bool=True):
+    global engine, worker, sim_running, drain_job, profiler, run_key
+    if (use_cache and not sim_running and sim_automatic.get() and SPEEDS[speed_var.get()][0] is None and not profile_enabled.get()):
+        if show_cached_result():
+            return
+    stop_worker()
     if sim_running:
         sim_running = False
         toggle.configure(state="normal")
         run_button.configure(text="Run MLFQ")
+        pause_button.configure(text="Pause", state="disabled")
     else:
         sim_running = True
         toggle.configure(state="disabled")
         run_button.configure(text="Stop MLFQ")
-
-    current_card = None
-    current_process = None
-
-    # Reset queues, Gantt, and time
-    for queue in mlfq.values():
-        queue.get("queue", []).clear()
-    
-    sim_time = 0
-    for p in processes:
-        p.processed_time = 0
-        p.sub_wait_time = 0
-        p.burst_time = p.original_burst_time
-        p.priority = p.original_priority
+        pause_button.configure(text="Pause", state="normal" if sim_automatic.get() else "disabled")
 
     # Clear previous Gantt
-    for widget in gantt_inner.winfo_children():
-        widget.destroy()
+    gantt_chart.clear()
+    clear_queue_display()
     time_var.set("Time: 0")
+    if not sim_running:
+        return
 
-    # Sort processes by arrival then PID
-    processes.sort(key=lambda x: (x.arrival_time, int(x.name[1:])))
-
-    update_queue_display()
-    step()
+    # The engine resets queues, time and processes
+    sort_processes()
+    run_key = current_key()
+    if (cpu_count() > 1):
+        quantum_times = [mlfq[priority]["quantum_time"] for priority in sorted(mlfq)]
+        engine = SMPEngine(processes, quantum_times, cpus=cpu_count(), mode=SMP_MODES[smp_mode_var.get()], **settings)
+    else:
+        engine = MLFQEngine.from_settings(processes, mlfq, settings)
+    profiler = TickProfiler().attach(engine) if profile_enabled.get() else None
+    if (profiler):
+        show_profile()
+    ticks, delay = SPEEDS[speed_var.get()]
+    worker = SimulationWorker(engine, ticks, delay / 1000, paused=not sim_automatic.get())
+    worker.start()
+    worker.step()
+    drain_job = root.after(DRAIN_INTERVAL, drain_updates)
+
+
+# Profiler panel, only shown for runs started with Profile switched on
+def show_profile():
+    global profile_window
+    if (profile_window is None or not profile_window.winfo_exists()):
+        profile_window = ReportWindow("Scheduler Profile")
+    update_profile()
+
+
+def update_profile():
+    if (profile_window is not None and profile_window.winfo_exists()):
+        profile_window.update_text(profiler.format())
+
+
+# Runs MLFQ with the current settings and the baseline policies on the current processes.
+# The runs go on a thread, one policy at a time, and the report fills in as each one finishes.
+def compare_policies():
+    import policies
+    quantum_times = [mlfq[priority]["quantum_time"] for priority in sorted(mlfq)]
+    candidates = policies.default_policies(quantum_times, settings["aging_time"], settings["lower_priority_time"])
+    # The table is built here, so the thread never touches the processes the GUI edits
+    workload = ProcessTable.from_processes(processes)
+    rows:queue.Queue[dict] = queue.Queue()
+    window = ReportWindow("Policy Comparison")
+    threading.Thread(target=run_comparison, args=(workload, candidates, rows), daemon=True).start()
+    drain_comparison(window, rows, candidates, [])
+
+
+# One row per policy, then None once every policy has run
+def run_comparison(workload:ProcessTable, candidates:list, rows:queue.Queue):
+    import policies
+    try:
+        for policy in candidates:
+            rows.put(policies.compare(workload, [policy])[0])
+    finally:
+        rows.put(None)
+
+
+def drain_comparison(window:ReportWindow, rows:queue.Queue, candidates:list, done:list[dict]):
+    import policies
+    while True:
+        try:
+            row = rows.get_nowait()
+        except queue.Empty:
+            break
+        if (row is None):
+            window.update_text(policies.format_comparison(done))
+            return
+        done.append(row)
+    window.update_text(policies.format_comparison(done) + f"\n\nRunning {candidates[len(done)].name} ({len(done) + 1}/{len(candidates)})...")
+    root.after(DRAIN_INTERVAL, drain_comparison, window, rows, candidates, done)
 
 
 # Stats
-def update_stats():
-    total_wait = 0
-    total_turnaround = 0
-    total_response = 0
-    for p in processes:
-        total_wait += p.turnaround_time - p.original_burst_time
-        total_turnaround += p.turnaround_time
-        total_response += p.first_response - p.arrival_time
-    n = len(processes)
-    avg_wait = total_wait / n if n else 0
-    avg_turnaround = total_turnaround / n if n else 0
-    avg_response = total_response / n if n else 0
-    stats_var.set(f"Avg Waiting Time: {avg_wait:.2f} | Avg Turnaround Time: {avg_turnaround:.2f} | Avg Response Time: {avg_response:.2f}")
+def update_stats(result:ScheduleResult):
+    # numpy is only loaded once a run has finished
+    import stats
+    summary = stats.summarize(result)
+    waiting, turnaround, response = summary["waiting"], summary["turnaround"], summary["response"]
+    stats_var.set(
+        f"Avg Waiting Time: {waiting['mean']:.2f} | Avg Turnaround Time: {turnaround['mean']:.2f} | Avg Response Time: {response['mean']:.2f}"
+        f" | P95 Response: {response['p95']:.2f} | P99 Response: {response['p99']:.2f}"
+        + (f"\nCPU Utilisation: {summary['cpu_utilisation']:.0%} (cores {min(summary['core_utilisation']):.0%} - {max(summary['core_utilisation']):.0%})" if len(summary['core_utilisation']) > 1 else "")
+    )
 
 
 def toggle_action():
@@ -199,79 +428,99 @@ def toggle_action():
         step_button.configure(state="normal")
 
 
-# GUI
-root = tk.Tk()
-root.title("MLFQ Round Robin Scheduler")
-root.geometry("1080x720")
-root.wm_resizable(False, False)
-
-sim_automatic = tk.BooleanVar(value=True)
-
-top_frame = tk.Frame(root)
-top_frame.pack(side=tk.TOP, fill=tk.X)
-tk.Button(top_frame, text="Modify", command=lambda: ModifyWindow(processes, mlfq, settings, process_table)).pack(side=tk.LEFT, padx=5, pady=5)
-tk.Button(top_frame, text="Randomize (10)", command=lambda: randomize_processes(10)).pack(side=tk.LEFT, padx=5, pady=5)
-
-process_frame = tk.Frame(root)
-process_frame.pack(side=tk.TOP, fill=tk.BOTH)
-columns = ("PID", "Arrival", "Burst", "Priority")
-process_table = ttk.Treeview(process_frame, columns=columns, show="headings", height=6)
-for col in columns:
-    process_table.heading(col, text=col)
-    process_table.column(col, width=10)
-scrollbar = ttk.Scrollbar(process_frame, orient="vertical", command=process_table.yview)
-process_table.configure(yscroll=scrollbar.set)
-process_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-main_frame = tk.Frame(root)
-main_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-
-# Queue
-queue_frame = tk.Frame(main_frame, width=500)
-queue_frame.pack(side=tk.LEFT, fill=tk.BOTH, padx=10, pady=10)
-queue_frame.pack_propagate(False)
-tk.Label(queue_frame, text="Queue 1 (High)").pack()
-queue0_frame = tk.Frame(queue_frame)
-queue0_frame.pack(pady=5, fill=tk.X)
-tk.Label(queue_frame, text="Queue 2 (Medium)").pack()
-queue1_frame = tk.Frame(queue_frame)
-queue1_frame.pack(pady=5, fill=tk.X)
-tk.Label(queue_frame, text="Queue 3 (Low)").pack()
-queue2_frame = tk.Frame(queue_frame)
-queue2_frame.pack(pady=5, fill=tk.X)
-tk.Label(queue_frame, text="Queue 4 (Very Low)").pack()
-queue3_frame = tk.Frame(queue_frame)
-queue3_frame.pack(pady=5, fill=tk.X)
-queue_frames = [queue0_frame, queue1_frame, queue2_frame, queue3_frame]
-
-# Time counter above Gantt chart
-gantt_frame = tk.Frame(main_frame)
-gantt_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-time_var = tk.StringVar(value="Time:")
-gantt_top_frame = tk.Frame(gantt_frame)
-gantt_top_frame.pack(anchor='w', fill=tk.X)
-run_button = tk.Button(gantt_top_frame, text="Run MLFQ", command=simulate_mlfq_step)
-run_button.pack(side=tk.LEFT, padx=5, pady=5)
-toggle = tk.Checkbutton(gantt_top_frame, text="Automatic", variable=sim_automatic, command=toggle_action, indicatoron=0, relief=tk.SUNKEN, width=10)
-toggle.pack(side=tk.LEFT, padx=5, pady=5)
-step_button = tk.Button(gantt_top_frame, text="Step", command=step, state="disabled")
-step_button.pack(side=tk.LEFT, padx=5, pady=5)
-tk.Label(gantt_top_frame, textvariable=time_var, font=("Arial", 12)).pack(side=tk.LEFT)
-
-# Gantt chart scrollable
-gantt_canvas = tk.Canvas(gantt_frame, bg="white", height=100)
-h_scroll = tk.Scrollbar(gantt_frame, orient=tk.HORIZONTAL, command=gantt_canvas.xview)
-gantt_canvas.configure(xscrollcommand=h_scroll.set)
-gantt_canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
-h_scroll.pack(side=tk.TOP, fill=tk.X)
-gantt_inner = tk.Frame(gantt_canvas, bg="white")
-gantt_canvas.create_window((0, 0), window=gantt_inner, anchor="nw")
-gantt_inner.bind("<Configure>", lambda event: gantt_canvas.configure(scrollregion=gantt_canvas.bbox("all")))
+# GUI, built only when run as a script so the modules above import without Tk windows
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("MLFQ Round Robin Scheduler")
+    root.geometry("1080x720")
+    root.wm_resizable(False, False)
+
+    sim_automatic = tk.BooleanVar(value=True)
+
+    top_frame = tk.Frame(root)
+    top_frame.pack(side=tk.TOP, fill=tk.X)
+    tk.Button(top_frame, text="Modify", command=lambda: ModifyWindow(processes, mlfq, settings, process_table)).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Button(top_frame, text="Randomize (10)", command=lambda: randomize_processes(10)).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Label(top_frame, text="Seed").pack(side=tk.LEFT, pady=5)
+    seed_var = tk.StringVar()
+    tk.Entry(top_frame, textvariable=seed_var, width=10).pack(side=tk.LEFT, padx=5, pady=5)
+    seed_info_var = tk.StringVar()
+    tk.Label(top_frame, textvariable=seed_info_var).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Button(top_frame, text="Load Trace", command=load_trace_file).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Button(top_frame, text="Compare Policies", command=compare_policies).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Label(top_frame, text="CPUs").pack(side=tk.LEFT, pady=5)
+    cpus_var = tk.StringVar(value="1")
+    tk.Spinbox(top_frame, from_=1, to=64, textvariable=cpus_var, width=3).pack(side=tk.LEFT, padx=5, pady=5)
+    smp_mode_var = tk.StringVar(value=next(iter(SMP_MODES)))
+    ttk.Combobox(top_frame, textvariable=smp_mode_var, values=list(SMP_MODES), state="readonly", width=18).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Button(top_frame, text="Load State", command=load_state).pack(side=tk.RIGHT, padx=5, pady=5)
+    tk.Button(top_frame, text="Save State", command=save_state).pack(side=tk.RIGHT, padx=5, pady=5)
+    tk.Button(top_frame, text="Export Results", command=export_results).pack(side=tk.RIGHT, padx=5, pady=5)
+
+    process_frame = tk.Frame(root)
+    process_frame.pack(side=tk.TOP, fill=tk.BOTH)
+    columns = ("PID", "Arrival", "Burst", "Priority")
+    process_table = ttk.Treeview(process_frame, columns=columns, show="headings", height=6)
+    for col in columns:
+        process_table.heading(col, text=col)
+        process_table.column(col, width=10)
+    scrollbar = ttk.Scrollbar(process_frame, orient="vertical", command=process_table.yview)
+    process_table.configure(yscroll=scrollbar.set)
+    process_table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    main_frame = tk.Frame(root)
+    main_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    # Queue
+    queue_frame = tk.Frame(main_frame, width=500)
+    queue_frame.pack(side=tk.LEFT, fill=tk.BOTH, padx=10, pady=10)
+    queue_frame.pack_propagate(False)
+    tk.Label(queue_frame, text="Queue 1 (High)").pack()
+    queue0_frame = tk.Frame(queue_frame)
+    queue0_frame.pack(pady=5, fill=tk.X)
+    tk.Label(queue_frame, text="Queue 2 (Medium)").pack()
+    queue1_frame = tk.Frame(queue_frame)
+    queue1_frame.pack(pady=5, fill=tk.X)
+    tk.Label(queue_frame, text="Queue 3 (Low)").pack()
+    queue2_frame = tk.Frame(queue_frame)
+    queue2_frame.pack(pady=5, fill=tk.X)
+    tk.Label(queue_frame, text="Queue 4 (Very Low)").pack()
+    queue3_frame = tk.Frame(queue_frame)
+    queue3_frame.pack(pady=5, fill=tk.X)
+    queue_frames = [queue0_frame, queue1_frame, queue2_frame, queue3_frame]
+
+    # Time counter above Gantt chart
+    gantt_frame = tk.Frame(main_frame)
+    gantt_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    time_var = tk.StringVar(value="Time:")
+    gantt_top_frame = tk.Frame(gantt_frame)
+    gantt_top_frame.pack(anchor='w', fill=tk.X)
+    run_button = tk.Button(gantt_top_frame, text="Run MLFQ", command=simulate_mlfq_step)
+    run_button.pack(side=tk.LEFT, padx=5, pady=5)
+    toggle = tk.Checkbutton(gantt_top_frame, text="Automatic", variable=sim_automatic, command=toggle_action, indicatoron=0, relief=tk.SUNKEN, width=10)
+    toggle.pack(side=tk.LEFT, padx=5, pady=5)
+    step_button = tk.Button(gantt_top_frame, text="Step", command=step, state="disabled")
+    step_button.pack(side=tk.LEFT, padx=5, pady=5)
+    pause_button = tk.Button(gantt_top_frame, text="Pause", command=toggle_pause, state="disabled", width=6)
+    pause_button.pack(side=tk.LEFT, padx=5, pady=5)
+    speed_var = tk.StringVar(value=next(iter(SPEEDS)))
+    speed_box = ttk.Combobox(gantt_top_frame, textvariable=speed_var, values=list(SPEEDS), state="readonly", width=18)
+    speed_box.pack(side=tk.LEFT, padx=5, pady=5)
+    speed_box.bind("<<ComboboxSelected>>", change_speed)
+    tk.Button(gantt_top_frame, text="Jump to End", command=jump_to_end).pack(side=tk.LEFT, padx=5, pady=5)
+    profile_enabled = tk.BooleanVar(value=False)
+    tk.Checkbutton(gantt_top_frame, text="Profile", variable=profile_enabled).pack(side=tk.LEFT, padx=5, pady=5)
+    tk.Label(gantt_top_frame, textvariable=time_var, font=("Arial", 12)).pack(side=tk.LEFT)
+
+    # Gantt chart, Ctrl+wheel zooms and the wheel pans
+    gantt_chart = GanttChart(gantt_frame)
+    tk.Button(gantt_top_frame, text="-", width=2, command=lambda: gantt_chart.zoom(0.5)).pack(side=tk.RIGHT, padx=2)
+    tk.Button(gantt_top_frame, text="+", width=2, command=lambda: gantt_chart.zoom(2)).pack(side=tk.RIGHT, padx=2)
+
+    # Stats
+    stats_var = tk.StringVar()
+    tk.Label(root, textvariable=stats_var, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
 
-# Stats
-stats_var = tk.StringVar()
-tk.Label(root, textvariable=stats_var, font=("Arial", 12)).pack(pady=10, side=tk.BOTTOM)
-
-update_process_table()
-root.mainloop()
+    update_process_table()
+    root.mainloop()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import sys
+from engine import MLFQEngine, ScheduleResult
+from process_table import ProcessTable
+import traces
+
+
+# Command-line entry point for scripted runs:
+#   python -m mlfq run trace.csv --quanta 3,3,3,3
+#   python -m mlfq gui
+# Interpreter and import start-up dominate short runs, so only the engine and
+# the trace reader are imported up front. numpy (--stats, --export), the SMP
+# engine (--cpus) and Tk (gui) are imported by the commands that need them.
+
+
+def int_list(text:str) -> list[int]:
+    return [int(value) for value in text.split(",")]
+
+
+# Averages over the finished processes in plain Python, for runs without --stats
+def averages(result:ScheduleResult) -> dict:
+    table = result.processes
+    finished = [pid for pid in range(len(table)) if table.completion[pid] != ProcessTable.NOT_SET]
+    count = len(finished) or 1
+    response = sum(table.first_response[pid] - table.arrival[pid] for pid in finished)
+    turnaround = sum(table.completion[pid] - table.arrival[pid] for pid in finished)
+    waiting = turnaround - sum(table.burst[pid] + table.io[pid] for pid in finished)
+    start = min(table.arrival) if len(table) else 0
+    return {
+        "processes": len(finished),
+        "makespan": result.end_time - start,
+        "context_switches": max(result.dispatches - 1, 0),
+        "avg_response": response / count,
+        "avg_turnaround": turnaround / count,
+        "avg_waiting": waiting / count,
+    }
+
+
+# With --events the scheduling events go to a binary trace at events_path
+def schedule(workload:ProcessTable, args:argparse.Namespace, events_path:str=None) -> ScheduleResult:
+    if (args.cpus > 1):
+        from smp import SMPEngine
+        engine = SMPEngine(workload, args.quanta, args.aging, args.lower, args.cpus, args.mode, io_boost=args.io_boost)
+    else:
+        engine = MLFQEngine(workload, args.quanta, args.aging, args.lower, io_boost=args.io_boost)
+    if (events_path is None):
+        return engine.run(event_driven=args.event_driven)
+    from tracing import EventTracer
+    with EventTracer(events_path).attach(engine):
+        return engine.run(event_driven=args.event_driven)
+
+
+def run(args:argparse.Namespace):
+    workload = traces.load_trace(args.trace, len(args.quanta))
+    events_path = None
+    if (args.export and args.events):
+        os.makedirs(args.export, exist_ok=True)
+        events_path = os.path.join(args.export, "events.trc")
+    if (events_path):
+        # Events are only known from a real run, so this one skips the cache
+        result = schedule(workload, args, events_path)
+    elif (args.cache):
+        from cache import ResultCache, cache_key, workload_digest
+        options = {"cpus": args.cpus, "mode": args.mode} if args.cpus > 1 else {}
+        results = ResultCache(path=args.cache)
+        result = results.run(cache_key(workload_digest(workload), args.quanta, args.aging, args.lower, args.io_boost, **options), lambda: schedule(workload, args))
+        results.close()
+    else:
+        result = schedule(workload, args)
+    if (args.export):
+        import export
+        format = args.format or export.default_format()
+        export.export_result(result, args.export, format)
+        if (events_path):
+            export.export_events(events_path, os.path.join(args.export, f"events{export.EXTENSIONS[format]}"), format)
+            os.remove(events_path)
+    if (args.stats):
+        import stats
+        summary = stats.summarize(result)
+    else:
+        summary = averages(result)
+    if (args.gantt):
+        summary["gantt"] = [(segment.name, segment.start, segment.end) for segment in result.segments]
+    if (args.json):
+        print(json.dumps(summary))
+        return
+    for key, value in summary.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+def gui(args:argparse.Namespace):
+    import runpy
+    runpy.run_module("main", run_name="__main__")
+
+
+def main(argv:list[str]=None):
+    parser = argparse.ArgumentParser(prog="mlfq", description="Run the MLFQ scheduler on a trace, or open the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="schedule a .csv or .jsonl trace (optionally .gz) and print a summary")
+    run_parser.add_argument("trace")
+    run_parser.add_argument("--quanta", type=int_list, default=[3, 3, 3, 3], help="comma-separated quantum per level")
+    run_parser.add_argument("--aging", type=int, default=5)
+    run_parser.add_argument("--lower", type=int, default=6)
+    run_parser.add_argument("--cpus", type=int, default=1)
+    run_parser.add_argument("--mode", default="global", help="SMP queue mode with --cpus: global, steal or migrate")
+    run_parser.add_argument("--no-io-boost", dest="io_boost", action="store_false", help="do not move processes up a level when they block for IO early")
+    run_parser.add_argument("--event-driven", action="store_true", help="skip idle ticks instead of stepping every tick")
+    run_parser.add_argument("--stats", action="store_true", help="full distributions per priority (imports numpy)")
+    run_parser.add_argument("--gantt", action="store_true", help="include the Gantt segments")
+    run_parser.add_argument("--json", action="store_true", help="print the summary as one JSON line")
+    run_parser.add_argument("--export", metavar="DIR", help="write segments and per-process metrics as columnar files to DIR")
+    run_parser.add_argument("--format", choices=("arrow", "parquet", "npy"), help="export format, arrow when pyarrow is installed, else npy")
+    run_parser.add_argument("--events", action="store_true", help="also export every scheduling event with --export")
+    run_parser.add_argument("--cache", help="sqlite file of cached results, reused by runs with the same trace and settings")
+    run_parser.set_defaults(handler=run)
+    commands.add_parser("gui", help="open the Tk simulator").set_defaults(handler=gui)
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except (OSError, ValueError) as error:
+        print(f"mlfq: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,52 +1,23 @@
+import bisect
+import itertools
 import tkinter as tk
 from tkinter import ttk, messagebox
+from engine import GanttSegment
+from process import Process
 
 
-class Process:
-    def __init__(self, name:str, arrival_time:int, burst_time:int, priority:int=3):
-        self.name = name
-        self.arrival_time = arrival_time
-        self.original_burst_time = burst_time
-        self.burst_time = burst_time
-        self.original_priority = priority
-        self.priority = priority
-        self.first_response = 0
-        self.sub_wait_time = 0
-        self.processed_time = 0
-        self.processing_time = 0
-        self.completion_time = 0
-        self.waiting_time = 0
-        self.turnaround_time = 0
-
-    def complete(self, time):
-        self.completion_time = time
-        self.turnaround_time = self.completion_time - self.arrival_time
-    
-    def is_completed(self):
-        return self.burst_time == 0
-
-    def increase_priority(self):
-        self.priority -= 1
-        self.sub_wait_time = 0
-    
-    def decrease_priority(self):
-        self.priority += 1
-        self.processed_time = 0
-    
-    def wait(self):
-        self.sub_wait_time += 1
-    
-    def process(self):
-        self.processed_time += 1
-        self.burst_time -= 1
-    
-    def __str__(self):
-        return f"{self.name} (burst_time: {str(self.burst_time)}, processed_time: {str(self.processed_time)}, sub_wait_time: {str(self.sub_wait_time)}, arrival_time: {str(self.arrival_time)})"
+# Frame whose labels remember their text, so updates only reach Tk on a change
+class Card(tk.Frame):
+    def set_text(self, label:tk.Label, text:str):
+        if (self.texts.get(label) != text):
+            self.texts[label] = text
+            label.configure(text=text)
 
 
-class ProcessCard(tk.Frame):
+class ProcessCard(Card):
     def __init__(self, parent, process:Process):
         super().__init__(parent, bd=1, relief="solid", padx=5, pady=2)
+        self.texts:dict[tk.Label, str] = {}
         self.process = process
         tk.Label(self, text=process.name, font=("Arial", 12, "bold"), width=4, bg="lightblue").pack(side=tk.LEFT, padx=2)
         stats_frame = tk.Frame(self)
@@ -62,10 +33,9 @@ class ProcessCard(tk.Frame):
         self.pack(side=tk.LEFT, padx=5)
     
     def update_values(self):
-        self.burst_label.configure(text=f"BT:{self.process.burst_time}")
-        self.wait_label.configure(text=f"WT:{self.process.sub_wait_time}")
-        self.processed_label.configure(text=f"PT:{self.process.processed_time}")
-        self.arrival_label.configure(text=f"AT:{self.process.arrival_time}")
+        self.set_text(self.burst_label, f"BT:{self.process.burst_time}")
+        self.set_text(self.wait_label, f"WT:{self.process.sub_wait_time}")
+        self.set_text(self.processed_label, f"PT:{self.process.processed_time}")
 
 
 class ModifyWindow(tk.Toplevel):
@@ -219,29 +189,138 @@ class ModifyWindow(tk.Toplevel):
         self.destroy()
 
 
-class GanttCard(tk.Frame):
+# Plain-text report window, e.g. the live profiler output or a policy comparison
+class ReportWindow(tk.Toplevel):
+    def __init__(self, title:str, text:str=""):
+        super().__init__()
+        self.title(title)
+        self.text_var = tk.StringVar(value=text)
+        tk.Label(self, textvariable=self.text_var, font=("Courier", 10), justify=tk.LEFT, anchor="nw").pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def update_text(self, text:str):
+        if (self.winfo_exists()):
+            self.text_var.set(text)
+
+
+# Gantt chart drawn as canvas rectangles sized by time span. Only the segments
+# inside the visible time window are drawn, so the item count is bounded by the
+# canvas width however long the run gets; zooming and panning just redraw.
+class GanttChart:
     color = ["red", "orange", "blue", "green"]
+    bar_top = 10
+    bar_height = 50
 
-    def __init__(self, gantt_inner, current_process:Process):
-        super().__init__(gantt_inner, bd=1, relief='solid', padx=5, pady=2, bg=self.color[current_process.priority-1], width=current_process.burst_time * 20)
-        self.current_process = current_process
-        color = self.color[current_process.priority-1]
-        tk.Label(self, text=current_process.name, font=("Arial", 10, "bold"), bg=color).pack(side=tk.LEFT)
-        stats = tk.Frame(self, bg=color)
-        stats.pack(side=tk.LEFT, padx=2)
-        self.burst_label = tk.Label(stats, text=f"BT:{current_process.burst_time}", bg=color)
-        self.burst_label.pack(anchor='w')
-        self.processed_label = tk.Label(stats, text=f"PT:{current_process.processed_time}", bg=color)
-        self.processed_label.pack(anchor='w')
-        self.waiting_label = tk.Label(stats, text=f"WT:{current_process.sub_wait_time}", bg=color)
-        self.waiting_label.pack(anchor='w')
-        self.arrival_label = tk.Label(stats, text=f"AT:{current_process.arrival_time}", bg=color)
-        self.arrival_label.pack(anchor='w')
-        self.pack(side=tk.LEFT, padx=2, pady=2)
-    
-    def update_values(self):
-        self.burst_label.configure(text=f"BT:{self.current_process.burst_time}")
-        self.processed_label.configure(text=f"PT:{self.current_process.processed_time}")
-        self.waiting_label.configure(text=f"WT:{self.current_process.sub_wait_time}")
-        self.arrival_label.configure(text=f"AT:{self.current_process.arrival_time}")
-        
+    def __init__(self, parent, unit_width:float=20):
+        self.canvas = tk.Canvas(parent, bg="white", height=100)
+        self.scrollbar = tk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.xview)
+        self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.TOP, fill=tk.X)
+        self.unit_width = unit_width
+        self.offset = 0.0
+        self.follow = True
+        self.segments:list[GanttSegment] = []
+        self.running:list[GanttSegment] = []
+        self.lanes = 1
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<Control-MouseWheel>", lambda event: self.zoom(1.25 if event.delta > 0 else 0.8, event.x))
+        self.canvas.bind("<Control-Button-4>", lambda event: self.zoom(1.25, event.x))
+        self.canvas.bind("<Control-Button-5>", lambda event: self.zoom(0.8, event.x))
+        self.canvas.bind("<MouseWheel>", lambda event: self.xview("scroll", -1 if event.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda event: self.xview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.xview("scroll", 1, "units"))
+
+    # segments is kept by reference, so a growing engine.segments list needs no copying.
+    # running holds the unfinished slices and lanes is the number of CPUs, one row each.
+    def update_chart(self, segments:list[GanttSegment], running:list[GanttSegment]=(), lanes:int=1):
+        self.segments = segments
+        self.running = running
+        self.lanes = lanes
+        if (self.follow):
+            self.offset = max(0.0, self.end_time() - self.visible_units())
+        self.redraw()
+
+    def clear(self):
+        self.offset = 0.0
+        self.follow = True
+        self.update_chart([], [])
+
+    def end_time(self) -> int:
+        if (self.running):
+            return max(segment.end for segment in self.running)
+        return self.segments[-1].end if self.segments else 0
+
+    def visible_units(self) -> float:
+        return max(self.canvas.winfo_width(), 1) / self.unit_width
+
+    def xview(self, *args):
+        total = max(self.end_time(), self.visible_units())
+        if (args[0] == "moveto"):
+            self.offset = float(args[1]) * total
+        elif (args[0] == "scroll"):
+            step = self.visible_units() * (0.9 if args[2] == "pages" else 0.1)
+            self.offset += int(args[1]) * step
+        self.offset = min(max(self.offset, 0.0), max(self.end_time() - self.visible_units(), 0.0))
+        self.follow = self.offset + self.visible_units() >= self.end_time()
+        self.redraw()
+
+    def zoom(self, factor:float, anchor_x:int=0):
+        anchor_time = self.offset + anchor_x / self.unit_width
+        self.unit_width = min(max(self.unit_width * factor, 0.01), 200)
+        self.offset = max(anchor_time - anchor_x / self.unit_width, 0.0)
+        self.xview("scroll", 0, "units")
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        start, end = self.offset, self.offset + self.visible_units()
+        first = bisect.bisect_right(self.segments, start, key=lambda segment: segment.end)
+        # Segments are ordered by end time across all lanes, so a lane is only done once one of its own segments starts past the view
+        height = self.lane_height()
+        last_x = [-1] * self.lanes
+        done:set[int] = set()
+        for segment in itertools.chain(itertools.islice(self.segments, first, None), self.running):
+            if (segment.start >= end):
+                done.add(segment.cpu)
+                if (len(done) == self.lanes):
+                    break
+                continue
+            x0 = (segment.start - start) * self.unit_width
+            x1 = (segment.end - start) * self.unit_width
+            # Several segments inside one pixel column are drawn once
+            if (x1 <= last_x[segment.cpu] + 1):
+                continue
+            last_x[segment.cpu] = x1
+            y0 = self.bar_top + segment.cpu * height
+            color = self.color[(segment.priority - 1) % len(self.color)]
+            canvas.create_rectangle(x0, y0, x1, y0 + height, fill=color, outline="black")
+            if (x1 - x0 >= 24 and height >= 14):
+                canvas.create_text((x0 + x1) / 2, y0 + height / 2, text=segment.name, font=("Arial", 10, "bold"))
+        self.draw_axis(start, end)
+        total = max(self.end_time(), end)
+        self.scrollbar.set(start / total if total else 0.0, end / total if total else 1.0)
+
+    # One bar_height lane per CPU, squeezed to fit the canvas when there are many
+    def lane_height(self) -> float:
+        if (self.lanes == 1):
+            return self.bar_height
+        space = self.canvas.winfo_height() - self.bar_top - 25
+        return max(min(self.bar_height, space / self.lanes), 2)
+
+    def draw_axis(self, start:float, end:float):
+        y = self.bar_top + self.lane_height() * self.lanes
+        spacing = self.axis_spacing()
+        tick = int(start // spacing) * spacing
+        while (tick <= end):
+            x = (tick - start) * self.unit_width
+            self.canvas.create_line(x, y, x, y + 5)
+            self.canvas.create_text(x, y + 14, text=str(tick), font=("Arial", 8))
+            tick += spacing
+
+    # Smallest 1-2-5 step that keeps axis labels at least 40 px apart
+    def axis_spacing(self) -> int:
+        magnitude = 1
+        while True:
+            for multiple in (1, 2, 5):
+                if (multiple * magnitude * self.unit_width >= 40):
+                    return multiple * magnitude
+            magnitude *= 10
@@ -0,0 +1,417 @@
+import argparse
+import heapq
+import random
+from collections import deque
+from typing import Callable, Iterable, Iterator
+from engine import GanttSegment, MLFQEngine
+from process import Process
+from process_table import ProcessTable
+from ready_queue import ReadyQueue
+import stats
+
+
+# Scheduling policy: owns the ready processes and makes every decision for a
+# PolicyEngine. push() queues an arriving process, pop() selects the next one to
+# run, quantum() is the length of its slice (None runs it until it completes or
+# is preempted), requeue() puts it back at the end of a slice and returns True if
+# it was demoted, and preempts() says whether a queued process should take the
+# CPU from the running one right away. Policies with aging promote waiting
+# processes in age() and report the next tick that can happen at in next_aging().
+# blocked() may change the level of a process that leaves the CPU for IO and
+# returns the event for it ("promote" or "demote"), if any.
+class Policy:
+    name = "policy"
+    levels = 1
+    preemptive = False
+    aging = False
+
+    def reset(self):
+        self.next_seq = 0
+
+    # Every push stamps the same fields as ReadyQueue.push, so waiting times and `in` work for any policy
+    def stamp(self, process:Process, time:int):
+        process.enqueued_at = time
+        process.queue_seq = self.next_seq
+        self.next_seq += 1
+
+    def push(self, process:Process, time:int):
+        raise NotImplementedError
+
+    def pop(self) -> Process:
+        raise NotImplementedError
+
+    def level(self, priority:int) -> Iterator[Process]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __contains__(self, process:Process) -> bool:
+        return process.queue_seq is not None
+
+    def quantum(self, process:Process) -> int:
+        return None
+
+    def requeue(self, process:Process, time:int) -> bool:
+        self.push(process, time)
+        return False
+
+    def preempts(self, current:Process) -> bool:
+        return False
+
+    def blocked(self, process:Process, early:bool) -> str:
+        return None
+
+    def age(self, time:int) -> Iterable[Process]:
+        return ()
+
+    def next_aging(self) -> int:
+        return None
+
+
+# The engine's own scheduler as a policy: per-level quanta, demotion after
+# lower_priority_time units of CPU and promotion after aging_time in a queue
+class MLFQ(Policy):
+    name = "MLFQ"
+    aging = True
+
+    def __init__(self, quantum_times:list[int], aging_time:int=5, lower_priority_time:int=6, io_boost:bool=True):
+        self.quantum_times = list(quantum_times)
+        self.levels = len(self.quantum_times)
+        self.aging_time = aging_time
+        self.lower_priority_time = lower_priority_time
+        self.io_boost = io_boost
+        self.reset()
+
+    def reset(self):
+        self.queue = ReadyQueue(self.levels)
+
+    def push(self, process:Process, time:int):
+        self.queue.push(process, time)
+
+    def pop(self) -> Process:
+        return self.queue.pop()
+
+    def level(self, priority:int) -> Iterator[Process]:
+        return self.queue.level(priority)
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+    def quantum(self, process:Process) -> int:
+        return self.quantum_times[process.priority - 1]
+
+    def requeue(self, process:Process, time:int) -> bool:
+        demoted = process.processed_time >= self.lower_priority_time and process.priority < self.levels
+        if (demoted):
+            process.decrease_priority()
+        self.queue.push(process, time)
+        return demoted
+
+    # Same rule as MLFQEngine.block()
+    def blocked(self, process:Process, early:bool) -> str:
+        if (process.processed_time >= self.lower_priority_time and process.priority < self.levels):
+            process.decrease_priority()
+            return "demote"
+        if (early and self.io_boost and process.priority > 1):
+            process.increase_priority()
+            return "promote"
+        return None
+
+    def age(self, time:int) -> list[Process]:
+        queue = self.queue
+        deadline = time - self.aging_time
+        promoted = []
+        for priority in range(2, self.levels + 1):
+            while (queue.lengths[priority] and queue.peek(priority).enqueued_at <= deadline):
+                process = queue.popleft(priority)
+                process.increase_priority()
+                queue.push(process, time)
+                promoted.append(process)
+        return promoted
+
+    def next_aging(self) -> int:
+        fronts = [self.queue.peek(priority) for priority in range(2, self.levels + 1)]
+        deadlines = [process.enqueued_at + self.aging_time for process in fronts if process]
+        return min(deadlines) if deadlines else None
+
+
+# First come, first served: one FIFO queue, every process runs to completion
+class FCFS(Policy):
+    name = "FCFS"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.queue:deque[Process] = deque()
+
+    def push(self, process:Process, time:int):
+        self.stamp(process, time)
+        self.queue.append(process)
+
+    def pop(self) -> Process:
+        if (not self.queue):
+            return None
+        process = self.queue.popleft()
+        process.queue_seq = None
+        return process
+
+    def level(self, priority:int) -> Iterator[Process]:
+        return iter(self.queue if priority == 1 else ())
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+# Round robin: FCFS with a fixed time slice, preempted processes go to the back
+class RoundRobin(FCFS):
+    name = "RR"
+
+    def __init__(self, quantum_time:int=3):
+        self.quantum_time = quantum_time
+        super().__init__()
+
+    def quantum(self, process:Process) -> int:
+        return self.quantum_time
+
+
+# Shortest job first, non-preemptive: a heap on remaining burst time, ties in arrival order
+class SJF(Policy):
+    name = "SJF"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.heap:list[tuple[int, int, Process]] = []
+
+    def push(self, process:Process, time:int):
+        self.stamp(process, time)
+        heapq.heappush(self.heap, (process.burst_time, process.queue_seq, process))
+
+    def pop(self) -> Process:
+        if (not self.heap):
+            return None
+        process = heapq.heappop(self.heap)[2]
+        process.queue_seq = None
+        return process
+
+    def level(self, priority:int) -> Iterator[Process]:
+        return (process for _, _, process in sorted(self.heap)) if priority == 1 else iter(())
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+# Shortest remaining time first: SJF that hands the CPU over as soon as a
+# queued process needs strictly less time than the running one has left
+class SRTF(SJF):
+    name = "SRTF"
+    preemptive = True
+
+    def preempts(self, current:Process) -> bool:
+        return bool(self.heap) and self.heap[0][0] < current.burst_time
+
+
+# Lottery scheduling with a fixed slice. Each process holds levels + 1 - priority
+# tickets, so processes are bucketed by ticket count: a draw picks a bucket by its
+# share of the tickets, then a process in it uniformly, both in O(levels).
+class Lottery(Policy):
+    name = "Lottery"
+
+    def __init__(self, quantum_time:int=3, seed:int=0, levels:int=4):
+        self.quantum_time = quantum_time
+        self.seed = seed
+        self.priorities = levels
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.rng = random.Random(self.seed)
+        self.buckets:dict[int, list[Process]] = {tickets: [] for tickets in range(self.priorities, 0, -1)}
+        self.count = 0
+
+    def tickets(self, process:Process) -> int:
+        return self.priorities + 1 - min(max(process.priority, 1), self.priorities)
+
+    def push(self, process:Process, time:int):
+        self.stamp(process, time)
+        self.buckets[self.tickets(process)].append(process)
+        self.count += 1
+
+    def pop(self) -> Process:
+        if (not self.count):
+            return None
+        draw = self.rng.randrange(sum(tickets * len(bucket) for tickets, bucket in self.buckets.items()))
+        for tickets, bucket in self.buckets.items():
+            draw -= tickets * len(bucket)
+            if (draw < 0):
+                break
+        index = self.rng.randrange(len(bucket))
+        bucket[index], bucket[-1] = bucket[-1], bucket[index]
+        process = bucket.pop()
+        process.queue_seq = None
+        self.count -= 1
+        return process
+
+    def level(self, priority:int) -> Iterator[Process]:
+        if (priority != 1):
+            return iter(())
+        return iter(sorted((process for bucket in self.buckets.values() for process in bucket), key=lambda process: process.queue_seq))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def quantum(self, process:Process) -> int:
+        return self.quantum_time
+
+
+# Engine that leaves the select, preempt and requeue decisions to a Policy.
+# It keeps MLFQEngine's tick semantics, so PolicyEngine(MLFQ(...)) schedules
+# exactly like MLFQEngine, which stays the faster choice for plain MLFQ runs.
+class PolicyEngine(MLFQEngine):
+    def __init__(
+        self, processes:list[Process]|ProcessTable|Iterable[Process], policy:Policy,
+        record_gantt:bool=True, keep_results:bool=True, on_complete:Callable[[Process], None]=None,
+    ):
+        self.policy = policy
+        super().__init__(
+            processes, getattr(policy, "quantum_times", [None] * policy.levels), getattr(policy, "aging_time", None),
+            getattr(policy, "lower_priority_time", None), record_gantt, keep_results, on_complete,
+        )
+
+    def reset(self):
+        super().reset()
+        self.policy.reset()
+        self.ready = self.policy
+
+    def age(self, time:int):
+        if (self.policy.aging):
+            for process in self.policy.age(time):
+                if (self.listeners):
+                    self.emit("promote", process)
+
+    def admit(self, time:int):
+        blocked = self.blocked
+        if (blocked and blocked[0][0] <= time):
+            self.wake(time)
+        process = self.next_process
+        while (process is not None and process.arrival_time <= time):
+            self.policy.push(process, time)
+            self.admitted += 1
+            if (self.listeners):
+                self.emit("arrive", process)
+            process = next(self.arrivals, None)
+        self.next_process = process
+
+    def process_current(self, time:int):
+        policy = self.policy
+        current = self.current
+        if (current):
+            current.process()
+            quantum = policy.quantum(current)
+            if ((quantum is not None and time - self.start_processing >= quantum) or current.is_completed() or (policy.preemptive and policy.preempts(current))):
+                if (self.record_gantt):
+                    self.segments.append(GanttSegment(current.name, self.start_processing, time, current.priority))
+                if (current.burst_time > 0):
+                    if (policy.requeue(current, time) and self.listeners):
+                        self.emit("demote", current)
+                    if (self.listeners):
+                        self.emit("preempt", current)
+                elif (current.pending_io()):
+                    self.block(current, time, quantum is None or time - self.start_processing < quantum)
+                else:
+                    self.finish(current, time)
+                self.dispatch()
+        else:
+            self.dispatch()
+
+    def block(self, process:Process, time:int, early:bool):
+        event = self.policy.blocked(process, early)
+        if (event and self.listeners):
+            self.emit(event, process)
+        heapq.heappush(self.blocked, (time + process.block(), self.block_seq, process))
+        self.block_seq += 1
+        if (self.listeners):
+            self.emit("block", process)
+
+    def queue_lengths(self) -> dict[int, int]:
+        return {priority: sum(1 for _ in self.policy.level(priority)) for priority in range(1, self.levels + 1)}
+
+    # Preemption only follows an arrival, so arrivals, slice ends and aging deadlines are still the only events
+    def next_event_time(self) -> int:
+        time = self.time
+        candidates = []
+        if (self.next_process is not None):
+            candidates.append(self.next_process.arrival_time)
+        if (self.blocked):
+            candidates.append(self.blocked[0][0])
+        if (self.current):
+            end = time + self.current.burst_time - 1
+            quantum = self.policy.quantum(self.current)
+            candidates.append(end if quantum is None else min(self.start_processing + quantum, end))
+        aging = self.policy.next_aging()
+        if (aging is not None):
+            candidates.append(aging)
+        return max(min(candidates), time) if candidates else None
+
+
+def default_policies(quantum_times:list[int]=(3, 3, 3, 3), aging_time:int=5, lower_priority_time:int=6, seed:int=0) -> list[Policy]:
+    quantum_time = quantum_times[0]
+    return [
+        MLFQ(quantum_times, aging_time, lower_priority_time), RoundRobin(quantum_time), FCFS(), SJF(), SRTF(),
+        Lottery(quantum_time, seed, len(quantum_times)),
+    ]
+
+
+# Runs every policy on the same workload and summarizes each run (see stats.summarize)
+def compare(workload:list[Process]|ProcessTable, policies:list[Policy], event_driven:bool=True) -> list[dict]:
+    if (isinstance(workload, list)):
+        workload = ProcessTable.from_processes(workload)
+    rows = []
+    for policy in policies:
+        engine = PolicyEngine(workload, policy, record_gantt=False)
+        summary = stats.summarize(engine.run(event_driven=event_driven))
+        rows.append({"policy": policy.name, **summary})
+    return rows
+
+
+def format_comparison(rows:list[dict]) -> str:
+    lines = [f"{'policy':<8} {'avg wait':>9} {'avg turn':>9} {'avg resp':>9} {'p95 resp':>9} {'p99 resp':>9} {'switches':>9}"]
+    for row in rows:
+        lines.append(
+            f"{row['policy']:<8} {row['waiting']['mean']:>9.2f} {row['turnaround']['mean']:>9.2f} {row['response']['mean']:>9.2f}"
+            f" {row['response']['p95']:>9.2f} {row['response']['p99']:>9.2f} {row['context_switches']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def int_list(text:str) -> list[int]:
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv:list[str]=None):
+    import traces
+    import workloads
+
+    parser = argparse.ArgumentParser(description="Compare MLFQ with RR, FCFS, SJF, SRTF and lottery scheduling on one workload.")
+    parser.add_argument("--trace", help="CSV or JSONL workload trace, optionally gzip-compressed")
+    parser.add_argument("--processes", type=int, default=1000, help="size of the random workload when no trace is given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quanta", type=int_list, default=[3, 3, 3, 3], help="MLFQ quanta per level, the first is also the RR and lottery slice")
+    parser.add_argument("--aging", type=int, default=5)
+    parser.add_argument("--lower", type=int, default=6)
+    args = parser.parse_args(argv)
+
+    workload = traces.load_trace(args.trace, len(args.quanta)) if args.trace else workloads.random_table(args.processes, args.seed)
+    print(format_comparison(compare(workload, default_policies(args.quanta, args.aging, args.lower, args.seed))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+class Process:
+    __slots__ = (
+        "pid", "name", "arrival_time", "original_burst_time", "burst_time", "original_priority", "priority",
+        "first_response", "sub_wait_time", "processed_time", "completion_time", "turnaround_time",
+        "queue_seq", "enqueued_at", "bursts", "burst_index",
+    )
+
+    def __init__(self, name:str, arrival_time:int, burst_time:int, priority:int=3, pid:int=None):
+        self.pid = pid
+        self.name = name
+        self.arrival_time = arrival_time
+        self.original_burst_time = burst_time
+        self.burst_time = burst_time
+        self.original_priority = priority
+        self.priority = priority
+        self.first_response = None
+        self.sub_wait_time = 0
+        self.processed_time = 0
+        self.completion_time = 0
+        self.turnaround_time = 0
+        self.queue_seq = None
+        self.enqueued_at = 0
+        self.bursts:tuple[int, ...] = None
+        self.burst_index = 0
+
+    # Process that alternates CPU and IO bursts: bursts is (cpu, io, cpu, ..., cpu).
+    # original_burst_time is the total CPU time and burst_time what is left of the current CPU burst.
+    @classmethod
+    def from_bursts(cls, name:str, arrival_time:int, bursts:list[int], priority:int=3, pid:int=None) -> "Process":
+        if (len(bursts) % 2 == 0 or any(burst <= 0 for burst in bursts)):
+            raise ValueError(f"{name}: bursts must alternate positive CPU and IO times, starting and ending with CPU")
+        process = cls(name, arrival_time, sum(bursts[::2]), priority, pid)
+        if (len(bursts) > 1):
+            process.bursts = tuple(bursts)
+            process.burst_time = bursts[0]
+        return process
+
+    @property
+    def io_time(self) -> int:
+        return sum(self.bursts[1::2]) if self.bursts else 0
+
+    def reset(self):
+        self.burst_time = self.bursts[0] if self.bursts else self.original_burst_time
+        self.burst_index = 0
+        self.priority = self.original_priority
+        self.first_response = None
+        self.sub_wait_time = 0
+        self.processed_time = 0
+        self.completion_time = 0
+        self.turnaround_time = 0
+        self.queue_seq = None
+        self.enqueued_at = 0
+
+    def complete(self, time):
+        self.completion_time = time
+        self.turnaround_time = self.completion_time - self.arrival_time
+    
+    # True once the current CPU burst is done, see pending_io() for what follows
+    def is_completed(self):
+        return self.burst_time == 0
+
+    def pending_io(self) -> bool:
+        return self.bursts is not None and self.burst_index + 1 < len(self.bursts)
+
+    # Ends the current CPU burst: returns the IO time that follows and loads the next CPU burst
+    def block(self) -> int:
+        io = self.bursts[self.burst_index + 1]
+        self.burst_index += 2
+        self.burst_time = self.bursts[self.burst_index]
+        return io
+
+    def increase_priority(self):
+        self.priority -= 1
+        self.sub_wait_time = 0
+    
+    def decrease_priority(self):
+        self.priority += 1
+        self.processed_time = 0
+    
+    def process(self, units:int=1):
+        self.processed_time += units
+        self.burst_time -= units
+    
+    def __str__(self):
+        return f"{self.name} (burst_time: {str(self.burst_time)}, processed_time: {str(self.processed_time)}, sub_wait_time: {str(self.sub_wait_time)}, arrival_time: {str(self.arrival_time)})"
@@ -0,0 +1,120 @@
+from array import array
+from typing import Iterator, NamedTuple
+from process import Process
+
+
+class ProcessResult(NamedTuple):
+    name:str
+    arrival_time:int
+    burst_time:int
+    priority:int
+    first_response:int
+    completion_time:int
+    io_time:int = 0
+
+    @property
+    def response_time(self) -> int:
+        return self.first_response - self.arrival_time
+
+    @property
+    def turnaround_time(self) -> int:
+        return self.completion_time - self.arrival_time
+
+    # Time spent ready but not running; blocked time is not waiting
+    @property
+    def waiting_time(self) -> int:
+        return self.turnaround_time - self.burst_time - self.io_time
+
+
+# Struct-of-arrays workload: one typed column per field, so a row costs a few
+# machine words instead of a Process object. Row i is the process with pid i.
+# The engine only builds Process objects for processes that have arrived and
+# writes their response and completion times back here when they finish.
+# CPU/IO burst sequences are only stored for the rows that have them, and io
+# holds each row's total IO time.
+class ProcessTable:
+    NOT_SET = -1
+
+    def __init__(self):
+        self.names:list[str] = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('b')
+        self.io = array('q')
+        self.sequences:dict[int, tuple[int, ...]] = {}
+        self.first_response = array('q')
+        self.completion = array('q')
+
+    @classmethod
+    def from_processes(cls, processes:list[Process]) -> "ProcessTable":
+        table = cls()
+        for process in processes:
+            process.pid = table.append(process.name, process.arrival_time, process.original_burst_time, process.original_priority, process.bursts)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.arrival)
+
+    def __getitem__(self, pid:int) -> ProcessResult:
+        first_response = self.first_response[pid]
+        completion = self.completion[pid]
+        return ProcessResult(
+            self.names[pid], self.arrival[pid], self.burst[pid], self.priority[pid],
+            None if first_response == self.NOT_SET else first_response,
+            None if completion == self.NOT_SET else completion, self.io[pid],
+        )
+
+    def __iter__(self) -> Iterator[ProcessResult]:
+        for pid in range(len(self)):
+            yield self[pid]
+
+    # With bursts, burst_time is ignored and the CPU total of the sequence is stored instead
+    def append(self, name:str, arrival_time:int, burst_time:int, priority:int, bursts:list[int]=None) -> int:
+        io_time = 0
+        # As in Process.from_bursts, a sequence replaces burst_time, even with a single CPU burst
+        if (bursts is not None):
+            if (len(bursts) % 2 == 0 or any(burst <= 0 for burst in bursts)):
+                raise ValueError(f"{name}: bursts must alternate positive CPU and IO times, starting and ending with CPU")
+            burst_time = sum(bursts[::2])
+            if (len(bursts) > 1):
+                self.sequences[len(self.arrival)] = tuple(bursts)
+                io_time = sum(bursts[1::2])
+        if (burst_time <= 0):
+            raise ValueError(f"{name}: burst time must be positive")
+        self.names.append(name)
+        self.arrival.append(arrival_time)
+        self.burst.append(burst_time)
+        self.priority.append(priority)
+        self.io.append(io_time)
+        self.first_response.append(self.NOT_SET)
+        self.completion.append(self.NOT_SET)
+        return len(self.arrival) - 1
+
+    # Shares the workload columns but has its own result columns, so later runs on
+    # this table do not change it
+    def with_results(self) -> "ProcessTable":
+        table = ProcessTable()
+        table.names, table.arrival, table.burst, table.priority = self.names, self.arrival, self.burst, self.priority
+        table.io, table.sequences = self.io, self.sequences
+        table.first_response, table.completion = array('q', self.first_response), array('q', self.completion)
+        return table
+
+    def clear_results(self):
+        self.first_response = array('q', [self.NOT_SET]) * len(self)
+        self.completion = array('q', [self.NOT_SET]) * len(self)
+
+    def process(self, pid:int) -> Process:
+        if (pid in self.sequences):
+            return Process.from_bursts(self.names[pid], self.arrival[pid], self.sequences[pid], self.priority[pid], pid)
+        return Process(self.names[pid], self.arrival[pid], self.burst[pid], self.priority[pid], pid)
+
+    def record(self, process:Process):
+        self.first_response[process.pid] = process.first_response
+        self.completion[process.pid] = process.completion_time
+
+    # Row indices in arrival order, ties kept in row order
+    def arrival_order(self) -> Iterator[int]:
+        arrival = self.arrival
+        if (all(arrival[pid - 1] <= arrival[pid] for pid in range(1, len(arrival)))):
+            return iter(range(len(arrival)))
+        return iter(sorted(range(len(arrival)), key=arrival.__getitem__))
@@ -0,0 +1,106 @@
+from collections import Counter
+from time import perf_counter
+from engine import MLFQEngine
+from process import Process
+
+
+PHASES = ("aging", "arrivals", "processing", "display")
+
+
+# Per-phase timing, queue-length histograms and dispatch counts for one engine.
+# attach() swaps the engine's step() for a timed copy on that instance only, so
+# an engine without a profiler runs the plain step() with no overhead at all.
+# Dispatches are counted by wrapping select_from_queues() the same way. The
+# display phase is timed by the GUI around its redraws with time_display().
+class TickProfiler:
+    def __init__(self):
+        self.engine:MLFQEngine = None
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.total = dict.fromkeys(PHASES, 0.0)
+        self.worst = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.queue_lengths:dict[int, Counter] = {}
+        self.dispatches:Counter = Counter()
+
+    def attach(self, engine:MLFQEngine) -> "TickProfiler":
+        self.engine = engine
+        self.queue_lengths = {priority: Counter() for priority in range(1, engine.levels + 1)}
+        engine.step = self.step
+        select = engine.select_from_queues
+
+        def select_from_queues(*args) -> Process:
+            process = select(*args)
+            if (process):
+                self.dispatches[process.priority] += 1
+            return process
+
+        engine.select_from_queues = select_from_queues
+        return self
+
+    def detach(self):
+        if (self.engine is not None):
+            del self.engine.step
+            del self.engine.select_from_queues
+            self.engine = None
+
+    def record(self, phase:str, seconds:float):
+        self.total[phase] += seconds
+        self.calls[phase] += 1
+        if (seconds > self.worst[phase]):
+            self.worst[phase] = seconds
+
+    def time_display(self, start:float):
+        self.record("display", perf_counter() - start)
+
+    def step(self):
+        engine = self.engine
+        time = engine.time
+
+        start = perf_counter()
+        engine.age(time)
+        aged = perf_counter()
+        engine.admit(time)
+        admitted = perf_counter()
+        engine.process_current(time)
+        processed = perf_counter()
+        engine.time += 1
+
+        self.record("aging", aged - start)
+        self.record("arrivals", admitted - aged)
+        self.record("processing", processed - admitted)
+        self.ticks += 1
+        lengths = engine.queue_lengths()
+        for priority, histogram in self.queue_lengths.items():
+            histogram[lengths[priority]] += 1
+
+    def mean(self, phase:str) -> float:
+        return self.total[phase] / self.calls[phase] if self.calls[phase] else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "phases": {
+                phase: {"total": self.total[phase], "mean": self.mean(phase), "max": self.worst[phase], "calls": self.calls[phase]}
+                for phase in PHASES
+            },
+            "queue_lengths": {priority: dict(sorted(histogram.items())) for priority, histogram in self.queue_lengths.items()},
+            "dispatches": dict(sorted(self.dispatches.items())),
+        }
+
+    # Plain-text report, also used by the GUI panel
+    def format(self) -> str:
+        lines = [f"{'phase':<11} {'total (ms)':>11} {'mean (us)':>10} {'max (us)':>10} {'calls':>9}"]
+        for phase in PHASES:
+            lines.append(f"{phase:<11} {self.total[phase] * 1e3:>11.2f} {self.mean(phase) * 1e6:>10.2f} {self.worst[phase] * 1e6:>10.2f} {self.calls[phase]:>9}")
+        lines.append("")
+        lines.append(f"{'queue':<6} {'dispatches':>10} {'mean len':>9} {'max len':>8}")
+        for priority, histogram in self.queue_lengths.items():
+            # Copied first, the worker thread may still be counting
+            histogram = dict(histogram)
+            samples = sum(histogram.values())
+            mean = sum(length * count for length, count in histogram.items()) / samples if samples else 0.0
+            lines.append(f"{priority:<6} {self.dispatches[priority]:>10} {mean:>9.2f} {max(histogram, default=0):>8}")
+        return "\n".join(lines)
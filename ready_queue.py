@@ -0,0 +1,57 @@
+from collections import deque
+from typing import Iterator
+from process import Process
+
+
+# Multilevel ready queue: one deque per priority level. Every push hands the
+# process a sequence number (process.queue_seq), cleared again when it leaves,
+# so `in` is a field check. Pushes stamp process.enqueued_at, and since time
+# only moves forward each level is ordered by enqueue time: its front is always
+# the next one due for aging.
+class ReadyQueue:
+    def __init__(self, levels:int):
+        self.levels = levels
+        self.queues:dict[int, deque[Process]] = {priority: deque() for priority in range(1, levels + 1)}
+        self.lengths:dict[int, int] = {priority: 0 for priority in range(1, levels + 1)}
+        self.count = 0
+        self.next_seq = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __contains__(self, process:Process) -> bool:
+        return process.queue_seq is not None
+
+    def push(self, process:Process, time:int):
+        process.enqueued_at = time
+        process.queue_seq = self.next_seq
+        self.next_seq += 1
+        self.queues[process.priority].append(process)
+        self.lengths[process.priority] += 1
+        self.count += 1
+
+    def peek(self, priority:int) -> Process:
+        queue = self.queues[priority]
+        return queue[0] if queue else None
+
+    def popleft(self, priority:int) -> Process:
+        queue = self.queues[priority]
+        if (not queue):
+            return None
+        process = queue.popleft()
+        process.queue_seq = None
+        self.lengths[priority] -= 1
+        self.count -= 1
+        return process
+
+    def pop(self) -> Process:
+        for priority in range(1, self.levels + 1):
+            if (self.lengths[priority]):
+                return self.popleft(priority)
+        return None
+
+    def level(self, priority:int) -> Iterator[Process]:
+        return iter(self.queues[priority])
@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import json
+import random
+from collections import deque
+from time import perf_counter
+from engine import MLFQEngine
+from process import Process
+from process_table import ProcessTable
+
+
+# Line-delimited JSON protocol. Requests:
+#   {"op": "submit", "ref": any, "name": str, "burst": int | "bursts": [cpu, io, ..., cpu], "priority": int}
+#   {"op": "subscribe"}   rolling metrics every metrics_interval seconds
+#   {"op": "metrics"}     metrics once
+# Replies: {"event": "accepted" | "dispatch" | "complete" | "metrics" | "error", ...}
+
+
+# completions_per_sec counts the completions of the last second in this many buckets
+RATE_BUCKETS = 10
+
+
+def percentile(values:list[float], fraction:float) -> float:
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+class Job:
+    __slots__ = ("client", "ref", "received", "accepted", "dispatched")
+
+    def __init__(self, client:"Client", ref, received:float):
+        self.client = client
+        self.ref = ref
+        self.received = received
+        self.accepted:float = None
+        self.dispatched:float = None
+
+
+# Replies are collected per client and written once per clock iteration
+class Client:
+    def __init__(self, writer:asyncio.StreamWriter):
+        self.writer = writer
+        self.outbox:list[str] = []
+        self.subscribed = False
+
+    def send(self, message:dict):
+        self.outbox.append(json.dumps(message))
+
+    def flush(self):
+        if (self.outbox and not self.writer.is_closing()):
+            self.writer.write(("\n".join(self.outbox) + "\n").encode())
+        self.outbox.clear()
+
+
+# Long-running MLFQ scheduler that takes jobs over a socket while simulated time
+# advances at tick_seconds per tick. Submissions wait in a bounded queue: once
+# max_pending are waiting, readers stop reading, so the socket pushes back on
+# the clients. Each clock iteration admits up to batch_size of them at the
+# current tick, runs the ticks that are due and flushes the replies. Decision
+# latency is measured from reading a submission to its first dispatch.
+class SchedulerService:
+    def __init__(
+        self, quantum_times:list[int], aging_time:int=5, lower_priority_time:int=6, tick_seconds:float=0.001,
+        max_pending:int=10_000, batch_size:int=1_000, metrics_interval:float=1.0, window:int=10_000,
+    ):
+        self.engine = MLFQEngine(ProcessTable(), quantum_times, aging_time, lower_priority_time, record_gantt=False, keep_results=False)
+        self.engine.listeners.append(self.on_event)
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self.metrics_interval = metrics_interval
+        self.pending:asyncio.Queue[tuple[Process, Job]] = asyncio.Queue(max_pending)
+        self.jobs:dict[int, Job] = {}
+        self.clients:set[Client] = set()
+        self.next_job = 0
+        self.submitted = 0
+        self.completed = 0
+        # Rolling windows: (admission latency, decision latency) and (wall time, response, turnaround)
+        self.latencies:deque[tuple[float, float]] = deque(maxlen=window)
+        self.completions:deque[tuple[float, int, int]] = deque(maxlen=window)
+        # Completions per tenth of a second over the last second, for the rate; the
+        # window above is capped at `window` samples and would cap the rate with it
+        self.completion_buckets:deque[list[int]] = deque(maxlen=RATE_BUCKETS)
+
+    async def handle_client(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        client = Client(writer)
+        self.clients.add(client)
+        try:
+            while (line := await reader.readline()):
+                received = perf_counter()
+                message = None
+                try:
+                    message = json.loads(line)
+                    op = message.get("op")
+                    if (op == "submit"):
+                        await self.pending.put((self.parse_job(message), Job(client, message.get("ref"), received)))
+                    elif (op == "subscribe"):
+                        client.subscribed = True
+                    elif (op == "metrics"):
+                        client.send(self.metrics())
+                    else:
+                        raise ValueError(f"Unknown op {op!r}")
+                except (ValueError, KeyError, TypeError, AttributeError) as error:
+                    client.send({"event": "error", "ref": message.get("ref") if isinstance(message, dict) else None, "message": str(error)})
+                # A client that does not read its replies stops being read from
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(client)
+            writer.close()
+
+    def parse_job(self, message:dict) -> Process:
+        priority = int(message.get("priority", 3))
+        if (not 1 <= priority <= self.engine.levels):
+            raise ValueError(f"priority must be between 1 and {self.engine.levels}")
+        name = str(message.get("name", "job"))
+        if ("bursts" in message):
+            return Process.from_bursts(name, 0, [int(burst) for burst in message["bursts"]], priority)
+        burst = int(message["burst"])
+        if (burst <= 0):
+            raise ValueError("burst must be positive")
+        return Process(name, 0, burst, priority)
+
+    def admit_pending(self):
+        pending = self.pending
+        engine = self.engine
+        now = perf_counter()
+        for _ in range(min(pending.qsize(), self.batch_size)):
+            process, job = pending.get_nowait()
+            process.pid = self.next_job
+            self.next_job += 1
+            self.submitted += 1
+            job.accepted = now
+            self.jobs[process.pid] = job
+            engine.submit(process)
+            job.client.send({"event": "accepted", "ref": job.ref, "job": process.pid, "time": engine.time})
+
+    # Runs every tick up to and including target, skipping over the ticks where
+    # nothing but the running process changes, and letting idle time pass at once
+    def run_until(self, target:int):
+        engine = self.engine
+        while (engine.time <= target):
+            if (engine.is_finished()):
+                engine.time = target + 1
+                return
+            # Submitted processes wait for an idle CPU to pick them up on the next tick
+            if (engine.current is None and engine.ready):
+                engine.step()
+                continue
+            if (engine.next_event_time() > target):
+                if (engine.current):
+                    engine.current.process(target + 1 - engine.time)
+                engine.time = target + 1
+                return
+            engine.advance()
+
+    def on_event(self, event:str, time:int, process:Process, priority:int):
+        if (event == "dispatch"):
+            job = self.jobs.get(process.pid)
+            if (job is None):
+                return
+            if (job.dispatched is None):
+                job.dispatched = perf_counter()
+                self.latencies.append((job.accepted - job.received, job.dispatched - job.received))
+            job.client.send({"event": "dispatch", "job": process.pid, "time": time, "priority": priority})
+        elif (event == "complete"):
+            job = self.jobs.pop(process.pid, None)
+            if (job is None):
+                return
+            self.completed += 1
+            response = process.first_response - process.arrival_time
+            turnaround = process.completion_time - process.arrival_time
+            now = perf_counter()
+            self.completions.append((now, response, turnaround))
+            bucket = int(now * RATE_BUCKETS)
+            buckets = self.completion_buckets
+            if (buckets and buckets[-1][0] == bucket):
+                buckets[-1][1] += 1
+            else:
+                buckets.append([bucket, 1])
+            job.client.send({"event": "complete", "job": process.pid, "time": time, "response": response, "turnaround": turnaround})
+
+    def metrics(self) -> dict:
+        now = perf_counter()
+        admission = sorted(latency[0] for latency in self.latencies)
+        decision = sorted(latency[1] for latency in self.latencies)
+        oldest = int(now * RATE_BUCKETS) - RATE_BUCKETS
+        return {
+            "event": "metrics",
+            "time": self.engine.time,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "pending": self.pending.qsize(),
+            "queued": len(self.engine.ready),
+            "blocked": len(self.engine.blocked),
+            "completions_per_sec": sum(count for bucket, count in self.completion_buckets if bucket > oldest),
+            "response_mean": sum(completion[1] for completion in self.completions) / len(self.completions) if self.completions else 0.0,
+            "turnaround_mean": sum(completion[2] for completion in self.completions) / len(self.completions) if self.completions else 0.0,
+            "admission_latency_ms": {"p50": percentile(admission, 0.5) * 1e3, "p99": percentile(admission, 0.99) * 1e3},
+            "decision_latency_ms": {"p50": percentile(decision, 0.5) * 1e3, "p99": percentile(decision, 0.99) * 1e3, "max": decision[-1] * 1e3 if decision else 0.0},
+        }
+
+    async def run_clock(self):
+        start = perf_counter()
+        next_metrics = start + self.metrics_interval
+        while True:
+            now = perf_counter()
+            self.admit_pending()
+            self.run_until(int((now - start) / self.tick_seconds))
+            if (now >= next_metrics):
+                next_metrics = now + self.metrics_interval
+                metrics = self.metrics()
+                for client in self.clients:
+                    if (client.subscribed):
+                        client.send(metrics)
+            for client in self.clients:
+                client.flush()
+            await asyncio.sleep(0 if self.pending.qsize() else self.tick_seconds)
+
+    async def serve(self, host:str="127.0.0.1", port:int=7070, unix_path:str=None):
+        if (unix_path):
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        clock = asyncio.create_task(self.run_clock())
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                clock.cancel()
+
+
+# Load generator: submits `jobs` random jobs at `rate` per second, then reports
+# the achieved rate, the submit-to-first-dispatch round trip and the server metrics
+async def generate_load(host:str, port:int, unix_path:str, rate:int, jobs:int, seed:int=0, levels:int=4) -> dict:
+    if (unix_path):
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+    sent_at:dict[int, float] = {}
+    job_refs:dict[int, int] = {}
+    round_trips:list[float] = []
+    accepted = 0
+
+    async def read_replies():
+        nonlocal accepted
+        while (line := await reader.readline()):
+            message = json.loads(line)
+            if (message["event"] == "accepted"):
+                accepted += 1
+                job_refs[message["job"]] = message["ref"]
+            elif (message["event"] == "dispatch" and message["job"] in job_refs):
+                round_trips.append(perf_counter() - sent_at.pop(job_refs.pop(message["job"])))
+            elif (message["event"] == "metrics"):
+                return message
+
+    replies = asyncio.create_task(read_replies())
+    start = perf_counter()
+    batch = max(rate // 100, 1)
+    for first in range(0, jobs, batch):
+        lines = []
+        for ref in range(first, min(first + batch, jobs)):
+            sent_at[ref] = perf_counter()
+            lines.append(json.dumps({"op": "submit", "ref": ref, "name": f"J{ref}", "burst": rng.randint(1, 10), "priority": rng.randint(1, levels)}))
+        writer.write(("\n".join(lines) + "\n").encode())
+        await writer.drain()
+        delay = start + (first + batch) / rate - perf_counter()
+        if (delay > 0):
+            await asyncio.sleep(delay)
+    submit_time = perf_counter() - start
+    while (accepted < jobs):
+        await asyncio.sleep(0.01)
+    writer.write(b'{"op": "metrics"}\n')
+    await writer.drain()
+    server = await replies
+    writer.close()
+    round_trips.sort()
+    return {
+        "jobs": jobs,
+        "submissions_per_sec": jobs / submit_time if submit_time > 0 else 0.0,
+        "dispatched": len(round_trips),
+        "round_trip_ms": {"p50": percentile(round_trips, 0.5) * 1e3, "p99": percentile(round_trips, 0.99) * 1e3},
+        "server": server,
+    }
+
+
+def int_list(text:str) -> list[int]:
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv:list[str]=None):
+    parser = argparse.ArgumentParser(description="Run the MLFQ scheduler as a socket service, or generate load for it.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "load"):
+        command = commands.add_parser(name)
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=7070)
+        command.add_argument("--unix", help="Unix socket path instead of TCP")
+    serve, load = commands.choices["serve"], commands.choices["load"]
+    serve.add_argument("--quanta", type=int_list, default=[3, 3, 3, 3])
+    serve.add_argument("--aging", type=int, default=5)
+    serve.add_argument("--lower", type=int, default=6)
+    serve.add_argument("--tick-ms", type=float, default=1.0, help="wall-clock milliseconds per simulated tick")
+    serve.add_argument("--max-pending", type=int, default=10_000, help="submissions waiting before clients are pushed back")
+    serve.add_argument("--batch", type=int, default=1_000, help="submissions admitted per clock iteration")
+    load.add_argument("--rate", type=int, default=10_000, help="submissions per second")
+    load.add_argument("--jobs", type=int, default=50_000)
+    load.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if (args.command == "serve"):
+        service = SchedulerService(args.quanta, args.aging, args.lower, args.tick_ms / 1000, args.max_pending, args.batch)
+        try:
+            asyncio.run(service.serve(args.host, args.port, args.unix))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(asyncio.run(generate_load(args.host, args.port, args.unix, args.rate, args.jobs, args.seed)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import heapq
+from typing import Callable, Iterable
+from engine import GanttSegment, MLFQEngine, ScheduleResult
+from process import Process
+from process_table import ProcessTable
+from ready_queue import ReadyQueue
+
+
+# How ready processes are shared between the CPUs:
+#   global  - one MLFQ ready queue that every CPU dispatches from
+#   steal   - one queue per CPU; an idle CPU with an empty queue takes the next
+#             process of the longest queue
+#   migrate - one queue per CPU, rebalanced every migrate_interval ticks by
+#             moving processes from the longest queue to the shortest
+MODES = ("global", "steal", "migrate")
+
+
+class CPU:
+    def __init__(self, index:int, ready:ReadyQueue):
+        self.index = index
+        self.ready = ready
+        self.current:Process = None
+        self.start_processing:int = None
+        self.busy = 0
+
+    def load(self) -> int:
+        return len(self.ready) + (self.current is not None)
+
+
+# MLFQEngine on several CPUs. Every tick ages the queues, admits arrivals (to
+# the least loaded CPU when the queues are per CPU), runs one unit on each CPU
+# in index order and, on migration ticks, rebalances the queues. Slices,
+# demotion and aging follow the same rules as the single-CPU engine. A preempted process goes back to its own CPU's queue, and
+# migrated processes restart their aging clock in the queue they move to.
+# Gantt segments carry the CPU they ran on, and result().busy the busy ticks per CPU.
+class SMPEngine(MLFQEngine):
+    def __init__(
+        self, processes:list[Process]|ProcessTable|Iterable[Process], quantum_times:list[int], aging_time:int=5, lower_priority_time:int=6,
+        cpus:int=2, mode:str="global", migrate_interval:int=10,
+        record_gantt:bool=True, keep_results:bool=True, on_complete:Callable[[Process], None]=None, io_boost:bool=True,
+    ):
+        if (mode not in MODES):
+            raise ValueError(f"Unknown SMP mode {mode!r}, expected one of {', '.join(MODES)}")
+        if (cpus < 1):
+            raise ValueError("At least one CPU is needed")
+        self.cpu_count = cpus
+        self.mode = mode
+        self.migrate_interval = migrate_interval
+        super().__init__(processes, quantum_times, aging_time, lower_priority_time, record_gantt, keep_results, on_complete, io_boost)
+
+    def reset(self):
+        super().reset()
+        if (self.mode == "global"):
+            self.cpus = [CPU(index, self.ready) for index in range(self.cpu_count)]
+            self.queues = [self.ready]
+        else:
+            self.cpus = [CPU(index, ReadyQueue(self.levels)) for index in range(self.cpu_count)]
+            self.queues = [cpu.ready for cpu in self.cpus]
+        self.steals = 0
+        self.migrations = 0
+
+    def age(self, time:int):
+        deadline = time - self.aging_time
+        for ready in self.queues:
+            for priority in range(2, self.levels + 1):
+                while (ready.lengths[priority] and ready.peek(priority).enqueued_at <= deadline):
+                    process = ready.popleft(priority)
+                    process.increase_priority()
+                    ready.push(process, time)
+                    if (self.listeners):
+                        self.emit("promote", process)
+
+    def admit(self, time:int):
+        blocked = self.blocked
+        if (blocked and blocked[0][0] <= time):
+            self.wake(time)
+        process = self.next_process
+        while (process is not None and process.arrival_time <= time):
+            ready = self.ready if self.mode == "global" else min(self.cpus, key=CPU.load).ready
+            ready.push(process, time)
+            self.admitted += 1
+            if (self.listeners):
+                self.emit("arrive", process)
+            process = next(self.arrivals, None)
+        self.next_process = process
+
+    # Woken processes are placed like arrivals
+    def wake(self, time:int):
+        blocked = self.blocked
+        while (blocked and blocked[0][0] <= time):
+            process = heapq.heappop(blocked)[2]
+            ready = self.ready if self.mode == "global" else min(self.cpus, key=CPU.load).ready
+            ready.push(process, time)
+            if (self.listeners):
+                self.emit("wake", process)
+
+    def process_current(self, time:int):
+        for cpu in self.cpus:
+            current = cpu.current
+            if (current):
+                current.process()
+                cpu.busy += 1
+                if (time - cpu.start_processing >= self.quantum_times[current.priority - 1] or current.is_completed()):
+                    if (self.record_gantt):
+                        self.segments.append(GanttSegment(current.name, cpu.start_processing, time, current.priority, cpu.index))
+                    if (current.burst_time > 0):
+                        if (current.processed_time >= self.lower_priority_time and current.priority < self.levels):
+                            current.decrease_priority()
+                            if (self.listeners):
+                                self.emit("demote", current)
+                        cpu.ready.push(current, time)
+                        if (self.listeners):
+                            self.emit("preempt", current)
+                    elif (current.pending_io()):
+                        self.block(current, time, time - cpu.start_processing < self.quantum_times[current.priority - 1])
+                    else:
+                        self.finish(current, time)
+                    self.dispatch(cpu)
+            else:
+                self.dispatch(cpu)
+        if (self.mode == "migrate" and time % self.migrate_interval == 0):
+            self.migrate(time)
+
+    def select_from_queues(self, cpu:CPU) -> Process:
+        process = cpu.ready.pop()
+        if (process is None and self.mode == "steal"):
+            victim = max(self.cpus, key=lambda other: len(other.ready))
+            process = victim.ready.pop()
+            if (process):
+                self.steals += 1
+        if (process):
+            process.sub_wait_time = 0
+        return process
+
+    def dispatch(self, cpu:CPU):
+        cpu.current = self.select_from_queues(cpu)
+        if (cpu.current):
+            self.dispatches += 1
+            if (self.listeners):
+                self.emit("dispatch", cpu.current)
+            cpu.start_processing = self.time
+            if (cpu.current.first_response is None):
+                cpu.current.first_response = self.time
+        else:
+            cpu.start_processing = None
+
+    # Moves processes from the longest queue to the shortest until they differ by at most one,
+    # taking them from the lowest non-empty level of the longest queue
+    def migrate(self, time:int):
+        while True:
+            source = max(self.cpus, key=lambda cpu: len(cpu.ready)).ready
+            target = min(self.cpus, key=lambda cpu: len(cpu.ready)).ready
+            if (len(source) - len(target) <= 1):
+                return
+            priority = max(priority for priority in range(1, self.levels + 1) if source.lengths[priority])
+            target.push(source.popleft(priority), time)
+            self.migrations += 1
+
+    def next_event_time(self) -> int:
+        time = self.time
+        candidates = []
+        if (self.next_process is not None):
+            candidates.append(self.next_process.arrival_time)
+        if (self.blocked):
+            candidates.append(self.blocked[0][0])
+        for cpu in self.cpus:
+            if (cpu.current):
+                quantum_end = cpu.start_processing + self.quantum_times[cpu.current.priority - 1]
+                candidates.append(min(quantum_end, time + cpu.current.burst_time - 1))
+            elif (cpu.ready or (self.mode == "steal" and any(self.queues))):
+                # A CPU that went idle before another one requeued its process dispatches on the next tick
+                candidates.append(time)
+        for ready in self.queues:
+            for priority in range(2, self.levels + 1):
+                process = ready.peek(priority)
+                if (process):
+                    candidates.append(process.enqueued_at + self.aging_time)
+        if (self.mode == "migrate" and any(self.queues)):
+            candidates.append(-(-time // self.migrate_interval) * self.migrate_interval)
+        return max(min(candidates), time) if candidates else None
+
+    def advance(self):
+        target = self.next_event_time()
+        if (target is not None and target > self.time):
+            for cpu in self.cpus:
+                if (cpu.current):
+                    cpu.current.process(target - self.time)
+                    cpu.busy += target - self.time
+            self.time = target
+        self.step()
+
+    def queue_lengths(self) -> dict[int, int]:
+        return {priority: sum(ready.lengths[priority] for ready in self.queues) for priority in range(1, self.levels + 1)}
+
+    def queued(self) -> list[tuple[Process, int]]:
+        return [(process, priority) for priority in range(1, self.levels + 1) for ready in self.queues for process in ready.level(priority)]
+
+    def running_segments(self) -> list[GanttSegment]:
+        return [
+            GanttSegment(f"{cpu.current.name} BT:{cpu.current.burst_time}", cpu.start_processing, self.time - 1, cpu.current.priority, cpu.index)
+            for cpu in self.cpus if cpu.current
+        ]
+
+    # Busy share of each CPU between the first arrival and the last completion
+    def utilisation(self) -> list[float]:
+        start = min(self.table.arrival) if len(self.table) else 0
+        makespan = self.end_time - start
+        return [cpu.busy / makespan if makespan > 0 else 0.0 for cpu in self.cpus]
+
+    def result(self) -> ScheduleResult:
+        return ScheduleResult(list(self.segments), self.table.with_results(), self.end_time, self.dispatches, [cpu.busy for cpu in self.cpus])
+
+    def snapshot(self) -> bytes:
+        raise ValueError("Snapshots are only supported on a single CPU")
+
+    def restore(self, data:bytes):
+        raise ValueError("Snapshots are only supported on a single CPU")
@@ -0,0 +1,72 @@
+import numpy as np
+from engine import ScheduleResult
+from process_table import ProcessTable
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def table_columns(table:ProcessTable) -> dict[str, np.ndarray]:
+    # array('q') columns share their buffer with these arrays, nothing is copied
+    return {
+        "arrival": np.frombuffer(table.arrival, dtype=np.int64),
+        "burst": np.frombuffer(table.burst, dtype=np.int64),
+        "priority": np.frombuffer(table.priority, dtype=np.int8),
+        "io": np.frombuffer(table.io, dtype=np.int64),
+        "first_response": np.frombuffer(table.first_response, dtype=np.int64),
+        "completion": np.frombuffer(table.completion, dtype=np.int64),
+    }
+
+
+def describe(values:np.ndarray) -> dict[str, float]:
+    if (not len(values)):
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p95, p99 = np.percentile(values, PERCENTILES)
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(values.max())}
+
+
+# Waiting time is time spent ready, so the IO time of blocking processes is left out
+def metrics(arrival:np.ndarray, burst:np.ndarray, first_response:np.ndarray, completion:np.ndarray, io:np.ndarray) -> dict[str, dict[str, float]]:
+    turnaround = completion - arrival
+    return {
+        "waiting": describe(turnaround - burst - io),
+        "turnaround": describe(turnaround),
+        "response": describe(first_response - arrival),
+    }
+
+
+# Summary of a finished run: wait/turnaround/response distributions overall and
+# per original priority level, plus throughput, CPU utilisation (overall and per
+# core) and context switches
+def summarize(result:ScheduleResult) -> dict:
+    columns = table_columns(result.processes)
+    done = columns["completion"] != ProcessTable.NOT_SET
+    arrival = columns["arrival"][done]
+    burst = columns["burst"][done]
+    priority = columns["priority"][done]
+    first_response = columns["first_response"][done]
+    completion = columns["completion"][done]
+    io = columns["io"][done]
+
+    start = int(arrival.min()) if len(arrival) else 0
+    makespan = result.end_time - start
+    busy = int(burst.sum())
+    cores = len(result.busy) if result.busy else 1
+
+    summary = {
+        "processes": int(done.sum()),
+        "makespan": makespan,
+        "throughput": len(arrival) / makespan if makespan > 0 else 0.0,
+        "cpu_utilisation": busy / (makespan * cores) if makespan > 0 else 0.0,
+        "core_utilisation": [core_busy / makespan if makespan > 0 else 0.0 for core_busy in (result.busy or [busy])],
+        "context_switches": max(result.dispatches - 1, 0),
+        **metrics(arrival, burst, first_response, completion, io),
+        "by_priority": {},
+    }
+    for level in np.unique(priority):
+        mask = priority == level
+        summary["by_priority"][int(level)] = {
+            "processes": int(mask.sum()),
+            **metrics(arrival[mask], burst[mask], first_response[mask], completion[mask], io[mask]),
+        }
+    return summary
@@ -0,0 +1,134 @@
+import argparse
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, NamedTuple
+from cache import ResultCache, cache_key, workload_digest
+from engine import MLFQEngine, ScheduleResult
+from process_table import ProcessTable
+import stats
+import traces
+import workloads
+
+
+OBJECTIVES = ("avg_response", "p99_response", "avg_turnaround")
+
+
+class SweepConfig(NamedTuple):
+    quantum_times:tuple[int, ...]
+    aging_time:int
+    lower_priority_time:int
+
+
+def grid(quantum_values:list[int], aging_values:list[int], lower_values:list[int], levels:int=4) -> Iterator[SweepConfig]:
+    for quanta in itertools.product(quantum_values, repeat=levels):
+        for aging_time, lower_priority_time in itertools.product(aging_values, lower_values):
+            yield SweepConfig(quanta, aging_time, lower_priority_time)
+
+
+def random_search(samples:int, quantum_range:tuple[int, int], aging_range:tuple[int, int], lower_range:tuple[int, int], levels:int=4, seed:int=None) -> Iterator[SweepConfig]:
+    rng = random.Random(seed)
+    for _ in range(samples):
+        quanta = tuple(rng.randint(*quantum_range) for _ in range(levels))
+        yield SweepConfig(quanta, rng.randint(*aging_range), rng.randint(*lower_range))
+
+
+# Worker side: the workload is sent once per worker process, not once per task,
+# and hashed once per worker when results are cached
+_workload:ProcessTable = None
+_cache:ResultCache = None
+_digest:bytes = None
+
+
+def _init_worker(workload:ProcessTable, cache_path:str=None):
+    global _workload, _cache, _digest
+    _workload = workload
+    if (cache_path):
+        _cache = ResultCache(path=cache_path)
+        _digest = workload_digest(workload)
+
+
+def _schedule(config:SweepConfig) -> ScheduleResult:
+    return MLFQEngine(_workload, config.quantum_times, config.aging_time, config.lower_priority_time).run(event_driven=True)
+
+
+def _evaluate(config:SweepConfig) -> dict:
+    if (_cache is not None):
+        result = _cache.run(cache_key(_digest, *config), lambda: _schedule(config))
+    else:
+        result = _schedule(config)
+    summary = stats.summarize(result)
+    return {
+        "quantum_times": list(config.quantum_times),
+        "aging_time": config.aging_time,
+        "lower_priority_time": config.lower_priority_time,
+        "avg_response": summary["response"]["mean"],
+        "p99_response": summary["response"]["p99"],
+        "avg_turnaround": summary["turnaround"]["mean"],
+        "p99_turnaround": summary["turnaround"]["p99"],
+        "avg_waiting": summary["waiting"]["mean"],
+        "context_switches": summary["context_switches"],
+    }
+
+
+# Rows not dominated by any other row on all objectives (lower is better)
+def pareto_front(rows:list[dict], objectives:tuple[str, ...]=OBJECTIVES) -> list[dict]:
+    front:list[dict] = []
+    for row in sorted(rows, key=lambda row: tuple(row[key] for key in objectives)):
+        point = tuple(row[key] for key in objectives)
+        if not any(all(other[key] <= value for key, value in zip(objectives, point)) for other in front):
+            front.append(row)
+    return front
+
+
+# Runs every configuration on all cores, appending one JSON line per result to
+# output_path as it comes in, and returns the Pareto-best configurations.
+# With cache_path, results are reused from and saved to that ResultCache file.
+def sweep(workload:ProcessTable, configs:Iterable[SweepConfig], output_path:str, workers:int=None, cache_path:str=None) -> list[dict]:
+    configs = list(configs)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(configs) // (workers * 4))
+    rows:list[dict] = []
+    with open(output_path, "w") as output, ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(workload, cache_path)) as pool:
+        for row in pool.map(_evaluate, configs, chunksize=chunksize):
+            output.write(json.dumps(row) + "\n")
+            rows.append({key: row[key] for key in ("quantum_times", "aging_time", "lower_priority_time", *OBJECTIVES)})
+    return pareto_front(rows)
+
+
+def int_list(text:str) -> list[int]:
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv:list[str]=None):
+    parser = argparse.ArgumentParser(description="Sweep MLFQ quanta, aging time and demotion threshold.")
+    parser.add_argument("--trace", help="CSV or JSONL workload trace, optionally gzip-compressed")
+    parser.add_argument("--processes", type=int, default=1000, help="size of the random workload when no trace is given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--levels", type=int, default=4)
+    parser.add_argument("--quanta", type=int_list, default=[1, 2, 3, 5, 8], help="grid values for every queue quantum")
+    parser.add_argument("--aging", type=int_list, default=[5, 10, 20])
+    parser.add_argument("--lower", type=int_list, default=[4, 6, 8])
+    parser.add_argument("--samples", type=int, help="random search with this many samples instead of a grid")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="sweep.jsonl")
+    parser.add_argument("--cache", help="sqlite file of cached results, reused across sweeps")
+    args = parser.parse_args(argv)
+
+    workload = traces.load_trace(args.trace, args.levels) if args.trace else workloads.random_table(args.processes, args.seed)
+    if (args.samples):
+        configs = random_search(
+            args.samples, (min(args.quanta), max(args.quanta)), (min(args.aging), max(args.aging)),
+            (min(args.lower), max(args.lower)), args.levels, args.seed,
+        )
+    else:
+        configs = grid(args.quanta, args.aging, args.lower, args.levels)
+
+    for row in sweep(workload, configs, args.output, args.workers, args.cache):
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
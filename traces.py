@@ -0,0 +1,119 @@
+import csv
+import gzip
+import json
+from typing import IO, Iterator
+from process import Process
+from process_table import ProcessTable
+
+
+FIELDS = ("name", "arrival", "burst", "priority", "bursts")
+
+
+def open_text(path:str, mode:str="r") -> IO[str]:
+    if (path.endswith(".gz")):
+        return gzip.open(path, mode + "t", newline="")
+    return open(path, mode, newline="")
+
+
+def trace_format(path:str) -> str:
+    base = path[:-3] if path.endswith(".gz") else path
+    if (base.endswith(".jsonl") or base.endswith(".ndjson")):
+        return "jsonl"
+    if (base.endswith(".csv")):
+        return "csv"
+    raise ValueError(f"Unknown trace format for {path}, expected .csv or .jsonl (optionally .gz)")
+
+
+# The optional bursts field is an alternating CPU/IO sequence (see Process.from_bursts):
+# space-separated in CSV, a list in JSONL. When it is set the burst field is not used.
+def parse_rows(path:str) -> Iterator[tuple[str, int, int, int, list[int]]]:
+    with open_text(path) as file:
+        if (trace_format(path) == "csv"):
+            reader = csv.reader(file)
+            header = next(reader, [])
+            missing = set(FIELDS[:3]) - set(header)
+            if (missing):
+                raise ValueError(f"{path}: missing columns {', '.join(sorted(missing))}")
+            name, arrival, burst = (header.index(field) for field in FIELDS[:3])
+            priority = header.index("priority") if "priority" in header else None
+            bursts = header.index("bursts") if "bursts" in header else None
+            for line, row in enumerate(reader, start=1):
+                try:
+                    sequence = [int(value) for value in row[bursts].split()] if bursts is not None and row[bursts] else None
+                    yield row[name], int(row[arrival]), int(row[burst]) if row[burst] else 0, int(row[priority]) if priority is not None else 3, sequence
+                except (IndexError, ValueError) as error:
+                    raise ValueError(f"{path}: row {line} is malformed ({error})") from None
+        else:
+            line = 0
+            for text in file:
+                if (text.strip()):
+                    line += 1
+                    try:
+                        row = json.loads(text)
+                        sequence = row.get("bursts")
+                        burst = int(row["burst"]) if "burst" in row or not sequence else 0
+                        yield str(row["name"]), int(row["arrival"]), burst, int(row.get("priority", 3)), [int(value) for value in sequence] if sequence else None
+                    except KeyError as error:
+                        raise ValueError(f"{path}: row {line} is missing {error}") from None
+                    except (AttributeError, TypeError, ValueError) as error:
+                        raise ValueError(f"{path}: row {line} is malformed ({error})") from None
+
+
+# Checked rows of a trace: a positive burst time or a valid bursts sequence, and
+# a priority from 1 to levels (from 1 up when levels is not given)
+def read_rows(path:str, levels:int=None) -> Iterator[tuple[str, int, int, int, list[int]]]:
+    for line, (name, arrival, burst, priority, bursts) in enumerate(parse_rows(path), start=1):
+        if (bursts):
+            if (len(bursts) % 2 == 0 or any(value <= 0 for value in bursts)):
+                raise ValueError(f"{path}: row {line} ({name}) bursts must alternate positive CPU and IO times, starting and ending with CPU")
+        elif (burst <= 0):
+            raise ValueError(f"{path}: row {line} ({name}) has a non-positive burst time")
+        if (priority < 1 or (levels is not None and priority > levels)):
+            raise ValueError(f"{path}: row {line} ({name}) has priority {priority}, expected 1 to {levels or 'the lowest level'}")
+        yield name, arrival, burst, priority, bursts
+
+
+# Streams the processes of a trace in file order. Rows must already be sorted by
+# arrival time, which lets the engine pull them lazily as the clock reaches them.
+def read_trace(path:str, levels:int=None) -> Iterator[Process]:
+    last_arrival = None
+    for line, (name, arrival, burst, priority, bursts) in enumerate(read_rows(path, levels), start=1):
+        if (last_arrival is not None and arrival < last_arrival):
+            raise ValueError(f"{path}: row {line} ({name}) arrives at {arrival}, before the previous row at {last_arrival}")
+        last_arrival = arrival
+        if (bursts):
+            yield Process.from_bursts(name, arrival, bursts, priority)
+        else:
+            yield Process(name, arrival, burst, priority)
+
+
+# Whole trace as a compact table, for runs that need the workload more than once
+def load_trace(path:str, levels:int=None) -> ProcessTable:
+    table = ProcessTable()
+    for name, arrival, burst, priority, bursts in read_rows(path, levels):
+        table.append(name, arrival, burst, priority, bursts)
+    return table
+
+
+# Completion sink for MLFQEngine(on_complete=...): writes one row per finished
+# process so long streamed runs need not keep per-process results in memory
+class ResultWriter:
+    def __init__(self, path:str):
+        self.file = open_text(path, "w")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(("name", "arrival", "burst", "priority", "first_response", "completion"))
+
+    def __call__(self, process:Process):
+        self.writer.writerow((
+            process.name, process.arrival_time, process.original_burst_time, process.original_priority,
+            process.first_response, process.completion_time,
+        ))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
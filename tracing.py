@@ -0,0 +1,109 @@
+import json
+import struct
+from typing import IO, Iterable, Iterator
+from engine import EVENTS, MLFQEngine
+from process import Process
+
+
+# Binary trace: MAGIC, a little-endian uint32 header length, a JSON header with
+# the event names, then fixed-size records of (time, event code, pid, priority)
+MAGIC = b"MLFQTRC1"
+RECORD = struct.Struct("<qBqb")
+EVENT_CODES = {event: code for code, event in enumerate(EVENTS)}
+
+
+# Engine listener that buffers scheduling events and writes them in batches,
+# either as compact binary records or as JSON lines. Only the event kinds in
+# `events` are kept; queue dumps are written only when dump_queues() is called.
+class EventTracer:
+    def __init__(self, path:str, format:str="binary", events:Iterable[str]=None, buffer_size:int=1 << 16):
+        if (format not in ("binary", "jsonl")):
+            raise ValueError(f"Unknown trace format {format!r}, expected 'binary' or 'jsonl'")
+        unknown = set(events or ()) - set(EVENTS)
+        if (unknown):
+            raise ValueError(f"Unknown trace events: {', '.join(sorted(unknown))}")
+        self.format = format
+        self.events = frozenset(events or EVENTS)
+        self.buffer_size = buffer_size
+        self.records = 0
+        if (format == "binary"):
+            self.file:IO = open(path, "wb")
+            header = json.dumps({"events": EVENTS}).encode()
+            self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+            self.buffer = bytearray()
+        else:
+            self.file = open(path, "w")
+            self.lines:list[str] = []
+
+    def attach(self, engine:MLFQEngine) -> "EventTracer":
+        engine.listeners.append(self)
+        return self
+
+    def __call__(self, event:str, time:int, process:Process, priority:int):
+        if (event not in self.events):
+            return
+        self.records += 1
+        if (self.format == "binary"):
+            self.buffer += RECORD.pack(time, EVENT_CODES[event], process.pid, priority)
+            if (len(self.buffer) >= self.buffer_size):
+                self.flush()
+        else:
+            self.lines.append(json.dumps({"time": time, "event": event, "pid": process.pid, "name": process.name, "priority": priority}) + "\n")
+            if (len(self.lines) * 64 >= self.buffer_size):
+                self.flush()
+
+    # Full queue contents at the current time, only written when asked for
+    def dump_queues(self, engine:MLFQEngine):
+        if (self.format != "jsonl"):
+            raise ValueError("Queue dumps are only written to JSONL traces")
+        self.lines.append(json.dumps({
+            "time": engine.time - 1,
+            "event": "queues",
+            "current": engine.current.name if engine.current else None,
+            "queues": {priority: [process.name for process in engine.ready.level(priority)] for priority in range(1, engine.levels + 1)},
+        }) + "\n")
+
+    def flush(self):
+        if (self.format == "binary"):
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        else:
+            self.file.writelines(self.lines)
+            self.lines.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "EventTracer":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_header(file:IO[bytes]) -> tuple[dict, int]:
+    if (file.read(len(MAGIC)) != MAGIC):
+        raise ValueError("Not an MLFQ binary trace")
+    (length,) = struct.unpack("<I", file.read(4))
+    return json.loads(file.read(length)), len(MAGIC) + 4 + length
+
+
+# Yields (time, event, pid, priority) from a binary trace
+def read_events(path:str) -> Iterator[tuple[int, str, int, int]]:
+    with open(path, "rb") as file:
+        header, _ = read_header(file)
+        events = header["events"]
+        while (chunk := file.read(RECORD.size * 4096)):
+            for time, code, pid, priority in RECORD.iter_unpack(chunk):
+                yield time, events[code], pid, priority
+
+
+# Binary trace records as a read-only memory-mapped NumPy structured array
+def load_events(path:str):
+    import numpy as np
+
+    with open(path, "rb") as file:
+        header, offset = read_header(file)
+    dtype = np.dtype([("time", "<i8"), ("event", "u1"), ("pid", "<i8"), ("priority", "i1")])
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset), header["events"]
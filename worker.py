@@ -0,0 +1,151 @@
+import queue
+import threading
+from time import perf_counter
+from typing import NamedTuple
+from engine import GanttSegment, MLFQEngine
+from process import Process
+
+
+# Seconds of simulation per published frame in "as fast as possible" mode
+FRAME_BUDGET = 1 / 30
+
+
+class Snapshot(NamedTuple):
+    time:int
+    events:list[tuple[str, Process, int]]
+    running:list[GanttSegment]
+    finished:bool
+    # Set after a restore: every queued process as (process, priority), so the display can be rebuilt
+    queued:list[tuple[Process, int]] = None
+
+
+# Runs an engine off the Tk main thread. The GUI sends commands through the
+# methods below and drains Snapshot objects from worker.updates with after().
+# Each snapshot carries the queue events since the previous one, so none are
+# lost when the GUI drains less often than the worker publishes.
+class SimulationWorker(threading.Thread):
+    def __init__(self, engine:MLFQEngine, ticks:int=1, delay:float=0.75, paused:bool=False):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.ticks = ticks
+        self.delay = delay
+        self.paused = paused
+        # Set by finish(): run headlessly to the end, FRAME_BUDGET at a time so commands still get through
+        self.finishing = False
+        self.commands:queue.Queue[tuple] = queue.Queue()
+        self.updates:queue.Queue[Snapshot] = queue.Queue()
+        self.errors:queue.Queue[Exception] = queue.Queue()
+        self.events:list[tuple[str, Process, int]] = []
+        engine.listeners.append(self.record)
+
+    def record(self, event:str, time:int, process:Process, priority:int):
+        self.events.append((event, process, priority))
+
+    # Commands, safe to call from any thread
+    def step(self):
+        self.commands.put(("step",))
+
+    def pause(self):
+        self.commands.put(("pause",))
+
+    def resume(self):
+        self.commands.put(("resume",))
+
+    def stop(self):
+        self.commands.put(("stop",))
+
+    def finish(self):
+        self.commands.put(("finish",))
+
+    def set_speed(self, ticks:int, delay:float):
+        self.commands.put(("speed", ticks, delay))
+
+    def save(self, path:str):
+        self.commands.put(("save", path))
+
+    def restore(self, data:bytes):
+        self.commands.put(("restore", data))
+
+    def run(self):
+        while True:
+            idle = self.paused or self.engine.is_finished()
+            try:
+                if (idle):
+                    command = self.commands.get()
+                elif (self.delay > 0 and not self.finishing):
+                    command = self.commands.get(timeout=self.delay)
+                else:
+                    command = self.commands.get_nowait()
+            except queue.Empty:
+                command = None
+
+            if (command):
+                if (command[0] == "stop"):
+                    return
+                self.handle(command)
+            elif (not idle):
+                self.run_frame()
+                if (not self.finishing or self.engine.is_finished()):
+                    self.publish()
+
+    def handle(self, command:tuple):
+        engine = self.engine
+        if (command[0] == "pause"):
+            self.paused = True
+            if (self.finishing):
+                # Pausing ends the jump: record events again and rebuild the display from here
+                self.finishing = False
+                engine.listeners.append(self.record)
+                self.publish(engine.queued())
+        elif (command[0] == "resume"):
+            self.paused = False
+        elif (command[0] == "speed"):
+            self.ticks, self.delay = command[1], command[2]
+        elif (command[0] == "step"):
+            # An engine that is done from the start (no processes) still reports that it finished
+            if (not engine.is_finished()):
+                engine.step()
+            self.publish()
+        elif (command[0] == "finish"):
+            # Headless run to the end: queue events are of no use to the display
+            if (self.record in engine.listeners):
+                engine.listeners.remove(self.record)
+            self.events = []
+            self.finishing = True
+            self.paused = False
+            if (engine.is_finished()):
+                self.publish()
+        elif (command[0] == "save"):
+            try:
+                with open(command[1], "wb") as file:
+                    file.write(engine.snapshot())
+            except (OSError, ValueError) as error:
+                self.errors.put(error)
+        elif (command[0] == "restore"):
+            try:
+                engine.restore(command[1])
+            except ValueError as error:
+                self.errors.put(error)
+                return
+            self.events = []
+            self.finishing = False
+            if (self.record not in engine.listeners):
+                engine.listeners.append(self.record)
+            self.publish(engine.queued())
+
+    def run_frame(self):
+        engine = self.engine
+        if (self.ticks is None or self.finishing):
+            deadline = perf_counter() + FRAME_BUDGET
+            while (not engine.is_finished() and perf_counter() < deadline):
+                engine.advance()
+        else:
+            for _ in range(self.ticks):
+                if (engine.is_finished()):
+                    break
+                engine.step()
+
+    def publish(self, queued:list[tuple[Process, int]]=None):
+        engine = self.engine
+        self.updates.put(Snapshot(engine.time - 1, self.events, engine.running_segments(), engine.is_finished(), queued))
+        self.events = []
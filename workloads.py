@@ -0,0 +1,39 @@
+import random
+from process import Process
+from process_table import ProcessTable
+
+
+# Seeded random workloads: the same seed always gives the same processes, so a
+# run can be replayed exactly or branched from a snapshot on another machine
+def random_processes(n:int, seed:int=None, max_arrival:int=10, max_burst:int=10, levels:int=4) -> list[Process]:
+    rng = random.Random(seed)
+    return [Process(f"P{i}", rng.randint(0, max_arrival), rng.randint(1, max_burst), rng.randint(1, levels)) for i in range(1, n + 1)]
+
+
+def random_table(n:int, seed:int=None, max_arrival:int=None, max_burst:int=10, levels:int=4) -> ProcessTable:
+    rng = random.Random(seed)
+    max_arrival = n if max_arrival is None else max_arrival
+    table = ProcessTable()
+    for i in range(1, n + 1):
+        table.append(f"P{i}", rng.randint(0, max_arrival), rng.randint(1, max_burst), rng.randint(1, levels))
+    return table
+
+
+# I/O-bound workload: each process alternates up to max_bursts short CPU bursts with longer IO waits
+def random_io_table(n:int, seed:int=None, max_arrival:int=None, max_bursts:int=5, max_cpu:int=4, max_io:int=20, levels:int=4) -> ProcessTable:
+    rng = random.Random(seed)
+    max_arrival = n if max_arrival is None else max_arrival
+    table = ProcessTable()
+    for arrival in sorted(rng.randint(0, max_arrival) for _ in range(n)):
+        cpu_bursts = rng.randint(1, max_bursts)
+        bursts = []
+        for burst in range(cpu_bursts):
+            bursts.append(rng.randint(1, max_cpu))
+            if (burst < cpu_bursts - 1):
+                bursts.append(rng.randint(1, max_io))
+        table.append(f"P{len(table) + 1}", arrival, sum(bursts[::2]), rng.randint(1, levels), bursts)
+    return table
+
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(1 << 32)